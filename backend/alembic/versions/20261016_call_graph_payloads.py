@@ -0,0 +1,42 @@
+"""Materialized call graph payload per repository
+
+Revision ID: call_graph_payloads
+Revises: callgraph_indexes
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'call_graph_payloads'
+down_revision: Union[str, None] = 'callgraph_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'call_graph_payloads',
+        sa.Column('repository_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('version', sa.String(length=64), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column(
+            'computed_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ['repository_id'], ['repositories.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('repository_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('call_graph_payloads')
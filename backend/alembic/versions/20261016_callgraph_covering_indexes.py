@@ -0,0 +1,44 @@
+"""Covering call_relationships indexes for the call graph endpoints
+
+Revision ID: callgraph_covering_indexes
+Revises: call_graph_payloads
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'callgraph_covering_indexes'
+down_revision: Union[str, None] = 'call_graph_payloads'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_callrel_repo_ext_caller_callee',
+        'call_relationships',
+        ['repository_id', 'is_external', 'caller_name', 'callee_name'],
+    )
+    op.create_index(
+        'idx_callrel_repo_callee_ext',
+        'call_relationships',
+        ['repository_id', 'callee_name', 'is_external'],
+    )
+    # Both are left prefixes of the new indexes
+    op.drop_index('idx_callrel_repo_external', table_name='call_relationships')
+    op.drop_index('idx_callrel_repo_callee', table_name='call_relationships')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'idx_callrel_repo_callee', 'call_relationships', ['repository_id', 'callee_name']
+    )
+    op.create_index(
+        'idx_callrel_repo_external', 'call_relationships', ['repository_id', 'is_external']
+    )
+    op.drop_index('idx_callrel_repo_callee_ext', table_name='call_relationships')
+    op.drop_index('idx_callrel_repo_ext_caller_callee', table_name='call_relationships')
@@ -0,0 +1,43 @@
+"""Composite call graph indexes and partial undocumented-symbol index
+
+Revision ID: callgraph_indexes
+Revises: file_scan_hashes
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'callgraph_indexes'
+down_revision: Union[str, None] = 'file_scan_hashes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_callrel_repo_caller', 'call_relationships', ['repository_id', 'caller_name']
+    )
+    op.create_index(
+        'idx_callrel_repo_callee', 'call_relationships', ['repository_id', 'callee_name']
+    )
+    op.create_index(
+        'idx_callrel_repo_external', 'call_relationships', ['repository_id', 'is_external']
+    )
+    op.create_index(
+        'idx_symbols_undocumented',
+        'symbols',
+        ['file_id', 'type'],
+        postgresql_where=sa.text('has_docstring = false'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_symbols_undocumented', table_name='symbols')
+    op.drop_index('idx_callrel_repo_external', table_name='call_relationships')
+    op.drop_index('idx_callrel_repo_callee', table_name='call_relationships')
+    op.drop_index('idx_callrel_repo_caller', table_name='call_relationships')
@@ -0,0 +1,32 @@
+"""Track the content hash each analysis scan last ran against
+
+Revision ID: file_scan_hashes
+Revises: symboltype_values
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'file_scan_hashes'
+down_revision: Union[str, None] = 'symboltype_values'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'files', sa.Column('duplication_scan_hash', sa.String(length=32), nullable=True)
+    )
+    op.add_column(
+        'files', sa.Column('smell_scan_hash', sa.String(length=32), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('files', 'smell_scan_hash')
+    op.drop_column('files', 'duplication_scan_hash')
@@ -0,0 +1,28 @@
+"""Store symboltype enum by value
+
+Revision ID: symboltype_values
+Revises: sprint14_cicd
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'symboltype_values'
+down_revision: Union[str, None] = 'sprint14_cicd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SymbolType is now persisted by value, so the only label that differs
+    # from its member name ('class_') is renamed to the value ('class').
+    # repostatus / reposource labels already equal their values.
+    op.execute("ALTER TYPE symboltype RENAME VALUE 'class_' TO 'class'")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TYPE symboltype RENAME VALUE 'class' TO 'class_'")
@@ -10,6 +10,7 @@ celery_app = Celery(
         "tasks.generate_embeddings",
         "tasks.import_github",
         "tasks.extract_call_graph",
+        "tasks.analysis_scans",
     ],
 )
 
@@ -30,4 +31,5 @@ celery_app.conf.task_routes = {
     "tasks.generate_embeddings.*": {"queue": "embeddings"},
     "tasks.import_github.*": {"queue": "default"},
     "tasks.extract_call_graph.*": {"queue": "default"},
+    "tasks.analysis_scans.*": {"queue": "analysis"},
 }
@@ -59,6 +59,9 @@ class Settings(BaseSettings):
     cache_analysis_ttl: int = 1800
     large_file_threshold: int = 100_000
     streaming_batch_size: int = 1_000
+    parse_cache_path: str = "/tmp/code_intel_parse_cache.sqlite3"
+    parse_cache_max_entries: int = 200_000
+    parse_cache_max_age_days: int = 30
     enable_metrics: bool = True
 
     # --- Sprint 14: CI/CD Integration ---
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -20,6 +20,21 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+class BulkInsertMixin:
+    """Adds a batched executemany insert for append-only fact tables."""
+
+    @classmethod
+    def bulk_insert(cls, session, rows: list[dict], batch_size: int = 500) -> int:
+        """
+        Insert plain dict rows in batches of `batch_size`.
+        Skips ORM object construction and the per-row flush; each batch
+        is sent as a single executemany. Returns the number of rows sent.
+        """
+        for i in range(0, len(rows), batch_size):
+            session.execute(insert(cls), rows[i : i + batch_size])
+        return len(rows)
+
+
 def get_db():
     """FASTAPI dependency = provides databse session."""
     db = SessionLocal()
@@ -47,6 +47,12 @@ class CodeIngestion:
             print(
                 f"🔧 Supported languages: {','.join(self.parser_manager.supported_languages())}"
             )
+            # Parsed up front across a process pool. Ingestion runs in a
+            # plain (non-daemonic) process, so unlike the prefork Celery
+            # parsing worker it may start one.
+            parsed = self.parser_manager.parse_files_parallel(
+                [str(p) for p in all_files], str(repository.id)
+            )
             total_symbols = 0
             files_by_language = {}
             for file_path in all_files:
@@ -75,9 +81,7 @@ class CodeIngestion:
                         )
                         db.add(file_record)
                         db.flush()
-                    symbols = self.parser_manager.parse_file(
-                        str(file_path), str(repository.id)
-                    )
+                    symbols = parsed.get(str(file_path), [])
                     if not symbols:
                         continue
                     if language not in files_by_language:
@@ -2,6 +2,7 @@ from models.code_duplication import CodeDuplication
 from models.code_smell import CodeSmell, SmellSeverity, SmellType
 from models.metrics_history import MetricsSnapshot
 
+from .call_graph_payload import CallGraphPayload
 from .call_relationship import CallRelationship
 from .cicd_run import CICDRun
 from .embedding import Embedding
@@ -20,6 +21,7 @@ __all__ = [
     "SymbolType",
     "Embedding",
     "CallRelationship",
+    "CallGraphPayload",
     "Vulnerability",
     "CodeDuplication",
     "CodeSmell",
@@ -0,0 +1,38 @@
+"""Materialized call graph JSON per repository"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database import Base
+
+
+class CallGraphPayload(Base):
+    """
+    Full call graph of a repository, serialized once per extraction run and
+    served verbatim by the call graph endpoint
+    """
+
+    __tablename__ = "call_graph_payloads"
+
+    repository_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("repositories.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # call_relationships version ("<max id>:<row count>") it was built from
+    version: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Kept as text, not JSONB, so it is returned without a parse/re-encode
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<CallGraphPayload(repository_id={self.repository_id}, "
+            f"version={self.version})>"
+        )
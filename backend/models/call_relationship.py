@@ -48,6 +48,18 @@ class CallRelationship(Base):
         Index("idx_callrel_caller_name", "caller_name"),
         Index("idx_callrel_callee_name", "callee_name"),
         Index("idx_callrel_is_external", "is_external"),
+        # Every call graph endpoint filters by repository first
+        Index("idx_callrel_repo_caller", "repository_id", "caller_name"),
+        # Cover the is_external-filtered caller/callee scans (stats, dead code,
+        # cycles) and the callee anti-join so they can run as index-only scans
+        Index(
+            "idx_callrel_repo_ext_caller_callee",
+            "repository_id",
+            "is_external",
+            "caller_name",
+            "callee_name",
+        ),
+        Index("idx_callrel_repo_callee_ext", "repository_id", "callee_name", "is_external"),
     )
 
     def to_dict(self):
@@ -8,15 +8,16 @@ from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from database import Base
+from database import Base, BulkInsertMixin
+from utils.uuid7 import uuid7
 
 
-class CodeDuplication(Base):
+class CodeDuplication(BulkInsertMixin, Base):
     """Stores detected code duplications across files"""
 
     __tablename__ = "code_duplication"
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     repository_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -5,12 +5,13 @@ import uuid
 from datetime import datetime
 from pathlib import Path
 
-from database import Base
+from database import Base, BulkInsertMixin
 from sqlalchemy import DateTime
 from sqlalchemy import Enum as SQLENUM
 from sqlalchemy import ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from utils.uuid7 import uuid7
 
 
 class SmellType(str, enum.Enum):
@@ -35,12 +36,12 @@ class SmellSeverity(str, enum.Enum):
     CRITICAL = "critical"
 
 
-class CodeSmell(Base):
+class CodeSmell(BulkInsertMixin, Base):
     """Stores detected code smells"""
 
     __tablename__ = "code_smells"
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     repository_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("repositories.id", ondelete="CASCADE")
@@ -56,12 +57,22 @@ class CodeSmell(Base):
     )
     # native_enum=True with explicit names matches the existing PostgreSQL ENUM types in DB
     smell_type: Mapped[SmellType] = mapped_column(
-        SQLENUM(SmellType, name="smelltype", values_callable=lambda x: [e.value for e in x]),
+        SQLENUM(
+            SmellType,
+            name="smelltype",
+            values_callable=lambda x: [e.value for e in x],
+            native_enum=True,
+        ),
         nullable=False,
         index=True,
     )
     severity: Mapped[SmellSeverity] = mapped_column(
-        SQLENUM(SmellSeverity, name="smellseverity", values_callable=lambda x: [e.value for e in x]),
+        SQLENUM(
+            SmellSeverity,
+            name="smellseverity",
+            values_callable=lambda x: [e.value for e in x],
+            native_enum=True,
+        ),
         nullable=False,
         index=True,
     )
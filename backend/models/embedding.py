@@ -1,18 +1,18 @@
-import uuid
 from datetime import datetime
 
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 
-from database import Base
+from database import Base, BulkInsertMixin
+from utils.uuid7 import uuid7
 
 
-class Embedding(Base):
+class Embedding(BulkInsertMixin, Base):
     """Embeddings table - stores vector representations of code symbols."""
 
     __tablename__ = "embeddings"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     symbol_id = Column(
         UUID(as_uuid=True),
         ForeignKey("symbols.id", ondelete="CASCADE"),
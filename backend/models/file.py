@@ -35,6 +35,13 @@ class File(Base):
 
     source: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
+    # Content hash each analysis last ran against, so a rescan can skip
+    # files that have not changed since
+    duplication_scan_hash: Mapped[Optional[str]] = mapped_column(
+        String(32), nullable=True
+    )
+    smell_scan_hash: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -8,6 +8,7 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database import Base
+from utils.uuid7 import uuid7
 
 
 class MetricsSnapshot(Base):
@@ -15,7 +16,7 @@ class MetricsSnapshot(Base):
 
     __tablename__ = "metrics_snapshots"
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     repository_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -34,7 +34,15 @@ class Repository(Base):
     upload_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
     source: Mapped[RepoSource] = mapped_column(
-        SQLEnum(RepoSource), default=RepoSource.upload, nullable=False, index=True
+        SQLEnum(
+            RepoSource,
+            name="reposource",
+            values_callable=lambda x: [e.value for e in x],
+            native_enum=True,
+        ),
+        default=RepoSource.upload,
+        nullable=False,
+        index=True,
     )
     github_url: Mapped[str | None] = mapped_column(
         String(500), nullable=True, index=True
@@ -48,7 +56,14 @@ class Repository(Base):
     github_language: Mapped[str | None] = mapped_column(String(50), nullable=True)
 
     status: Mapped[RepoStatus] = mapped_column(
-        SQLEnum(RepoStatus), default=RepoStatus.pending, index=True
+        SQLEnum(
+            RepoStatus,
+            name="repostatus",
+            values_callable=lambda x: [e.value for e in x],
+            native_enum=True,
+        ),
+        default=RepoStatus.pending,
+        index=True,
     )
 
     file_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -2,10 +2,10 @@ import enum
 import uuid
 from typing import Optional
 
-from database import Base
+from database import Base, BulkInsertMixin
 from sqlalchemy import Boolean, Column, DateTime
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import Float, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy import Float, ForeignKey, Index, Integer, String, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -20,7 +20,7 @@ class SymbolType(enum.Enum):
     label = "label"
 
 
-class Symbol(Base):
+class Symbol(BulkInsertMixin, Base):
     """Symbol table - stores functions, classes, etc."""
 
     __tablename__ = "symbols"
@@ -34,7 +34,17 @@ class Symbol(Base):
         index=True,
     )
     name: Mapped[str] = mapped_column(String, nullable=False, index=True)
-    type = Column(SQLEnum(SymbolType), nullable=False, index=True)
+    # Stored by value ("class", not "class_"); see migration symboltype_values
+    type = Column(
+        SQLEnum(
+            SymbolType,
+            name="symboltype",
+            values_callable=lambda x: [e.value for e in x],
+            native_enum=True,
+        ),
+        nullable=False,
+        index=True,
+    )
     line_start = Column(Integer, nullable=False)
     line_end = Column(Integer)
     signature: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -57,6 +67,13 @@ class Symbol(Base):
         Index("idx_symbols_name", "name"),
         Index("idx_symbols_type", "type"),
         Index("idx_symbols_file_name", "file_id", "name"),
+        # Undocumented-symbol listing and auto-documentation
+        Index(
+            "idx_symbols_undocumented",
+            "file_id",
+            "type",
+            postgresql_where=text("has_docstring = false"),
+        ),
     )
 
     def __repr__(self) -> str:
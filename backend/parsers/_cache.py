@@ -0,0 +1,115 @@
+"""
+Persistent parse cache keyed by (file path, BLAKE2b-128 of content).
+
+Re-indexing a repository mostly sees unchanged files; a hit here skips
+both tree-sitter parsing and symbol extraction. Payloads are the symbol
+lists as zlib-compressed JSON. Any SQLite error degrades to a cache miss.
+Entries older than parse_cache_max_age_days are evicted, and the oldest
+beyond parse_cache_max_entries, on connect and every PRUNE_INTERVAL puts.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+
+from config import settings
+
+_local = threading.local()
+
+# Bumped whenever the table layout changes; older files are rebuilt
+_SCHEMA_VERSION = 2
+
+# Puts per connection between two eviction passes
+PRUNE_INTERVAL = 1000
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    """Create the table, dropping earlier layouts (parse_cache, ast_cache v1)."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] == _SCHEMA_VERSION:
+        return
+    conn.execute("DROP TABLE IF EXISTS parse_cache")
+    conn.execute("DROP TABLE IF EXISTS ast_cache")
+    conn.execute(
+        "CREATE TABLE ast_cache ("
+        "path TEXT NOT NULL, digest BLOB NOT NULL, payload BLOB NOT NULL, "
+        "stored_at INTEGER NOT NULL, PRIMARY KEY (path, digest))"
+    )
+    conn.execute("CREATE INDEX ast_cache_stored_at ON ast_cache (stored_at)")
+    conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+
+def _prune(conn: sqlite3.Connection) -> None:
+    """Evict expired entries, then the oldest ones over the size cap."""
+    cutoff = int(time.time()) - settings.parse_cache_max_age_days * 86400
+    conn.execute("DELETE FROM ast_cache WHERE stored_at < ?", (cutoff,))
+    conn.execute(
+        "DELETE FROM ast_cache WHERE rowid IN ("
+        "SELECT rowid FROM ast_cache ORDER BY stored_at LIMIT "
+        "max(0, (SELECT COUNT(*) FROM ast_cache) - ?))",
+        (settings.parse_cache_max_entries,),
+    )
+
+
+def _connect() -> sqlite3.Connection:
+    """Return this thread's connection, creating the table on first use."""
+    conn = getattr(_local, "conn", None)
+    # A connection inherited across fork() (process-pool workers) is unsafe
+    if conn is None or _local.pid != os.getpid():
+        conn = sqlite3.connect(settings.parse_cache_path, isolation_level=None)
+        # WAL lets concurrent workers read while one writes; NORMAL sync is
+        # durable enough for a cache that can always be rebuilt
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            _create_schema(conn)
+        _prune(conn)
+        _local.conn = conn
+        _local.pid = os.getpid()
+        _local.puts = 0
+    return conn
+
+
+def content_digest(data: bytes) -> bytes:
+    """Cache key digest of file content (BLAKE2b is faster than SHA-256)."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def get(path: str, digest: bytes) -> Optional[List[Dict]]:
+    """Return the cached symbol list for (path, digest), or None on miss."""
+    try:
+        row = (
+            _connect()
+            .execute(
+                "SELECT payload FROM ast_cache WHERE path = ? AND digest = ?",
+                (path, digest),
+            )
+            .fetchone()
+        )
+    except sqlite3.Error:
+        return None
+    if row is None:
+        return None
+    return json.loads(zlib.decompress(row[0]))
+
+
+def put(path: str, digest: bytes, symbols: List[Dict]) -> None:
+    """Store the symbol list for (path, digest)."""
+    payload = zlib.compress(json.dumps(symbols).encode("utf-8"))
+    try:
+        conn = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO ast_cache (path, digest, payload, stored_at) "
+            "VALUES (?, ?, ?, ?)",
+            (path, digest, payload, int(time.time())),
+        )
+        _local.puts += 1
+        if _local.puts % PRUNE_INTERVAL == 0:
+            _prune(conn)
+    except sqlite3.Error:
+        pass
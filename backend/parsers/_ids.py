@@ -0,0 +1,24 @@
+"""
+Bulk generation of random (version 4) UUID strings for symbol rows.
+
+uuid.uuid4() makes one os.urandom(16) syscall and builds a UUID object
+per call; a file can yield thousands of symbols, so the randomness is
+drawn once per batch and formatted straight from hex.
+"""
+
+import binascii
+import os
+from typing import Iterator
+
+
+def uuid_batch(n: int) -> Iterator[str]:
+    """Yield `n` canonical UUIDv4 strings drawn from one os.urandom call."""
+    if n <= 0:
+        return
+    raw = bytearray(os.urandom(16 * n))
+    raw[6::16] = bytes((b & 0x0F) | 0x40 for b in raw[6::16])  # version 4
+    raw[8::16] = bytes((b & 0x3F) | 0x80 for b in raw[8::16])  # RFC 4122 variant
+    hexed = binascii.hexlify(raw).decode("ascii")
+    for i in range(0, 32 * n, 32):
+        h = hexed[i : i + 32]
+        yield f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
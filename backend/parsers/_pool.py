@@ -0,0 +1,29 @@
+"""
+Thread-local pool of tree-sitter parsers.
+
+Building a parser loads the grammar's shared library and allocates fresh
+parser state, so it is done once per (language, thread) and reused for
+every file afterwards. tree-sitter Parser objects are not thread-safe,
+hence one per thread rather than one per process.
+"""
+
+import threading
+from typing import Any, Callable, Dict
+
+_PARSER_POOL: Dict[str, threading.local] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def get_pooled_parser(language: str, factory: Callable[[], Any]) -> Any:
+    """
+    Return this thread's parser for `language`, building it with `factory`
+    on first use. A factory result of None (grammar unavailable) is cached
+    too, so the fallback decision is made once per thread.
+    """
+    local = _PARSER_POOL.get(language)
+    if local is None:
+        with _POOL_LOCK:
+            local = _PARSER_POOL.setdefault(language, threading.local())
+    if not hasattr(local, "parser"):
+        local.parser = factory()
+    return local.parser
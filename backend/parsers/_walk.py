@@ -0,0 +1,29 @@
+"""
+Iterative pre-order traversal of a tree-sitter syntax tree.
+
+Walking with a TreeCursor stays inside tree-sitter's C iterator instead
+of materializing `node.children` lists and a Python frame per node, so
+deep or large trees neither hit the recursion limit nor pay call overhead.
+"""
+
+from typing import AbstractSet, Any, Iterator
+
+
+def walk_nodes(node: Any, prune: AbstractSet[int] = frozenset()) -> Iterator[Any]:
+    """
+    Yield `node` and every descendant in document (pre-)order. Nodes whose
+    kind_id is in `prune` are yielded but their subtrees are skipped.
+    """
+    cursor = node.walk()
+    visited_children = False
+    while True:
+        if not visited_children:
+            current = cursor.node
+            yield current
+            if current.kind_id not in prune and cursor.goto_first_child():
+                continue
+            visited_children = True
+        if cursor.goto_next_sibling():
+            visited_children = False
+        elif not cursor.goto_parent():
+            break
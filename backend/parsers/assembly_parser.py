@@ -1,11 +1,37 @@
-import os
+import bisect
+import functools
+import logging
 import re
-import tempfile
-import uuid
+from dataclasses import asdict, dataclass
 from typing import Dict, List
 
+from tree_sitter import Query, QueryCursor
 from tree_sitter_languages import get_language, get_parser
 
+from parsers import _cache
+from parsers._ids import uuid_batch
+
+logger = logging.getLogger(__name__)
+
+# Leading [ \t]* stands in for the per-line strip() of the old line loop
+_LABEL_RE = re.compile(r"^[ \t]*([._a-zA-Z][._a-zA-Z0-9]*):(?![ \t]*;)", re.M)
+_SECTION_RE = re.compile(r"^[ \t]*\.(text|data|bss|rodata)(?=\s|$)", re.M)
+_GLOBAL_RE = re.compile(r"^[ \t]*\.(globl|global)\s+([._a-zA-Z][._a-zA-Z0-9]*)", re.M)
+
+
+@dataclass(slots=True)
+class AssemblySymbol:
+    """One symbol found by AssemblyParser (slotted: no per-row dict)"""
+
+    symbol_id: str
+    name: str
+    type: str
+    signature: str
+    file_path: str
+    start_line: int
+    end_line: int
+    repository_id: str
+
 
 class AssemblyParser:
     """Parser for x86/x64 Assembly (supports multiple syntaxes)"""
@@ -14,17 +40,44 @@ class AssemblyParser:
         try:
             self.parser = get_parser("asm")
             self.language = get_language("asm")
-        except:
-            print(
-                "⚠️  Tree-sitter assembly parser not available, using regex-based parsing"
+            self.label_query = Query(self.language, "(label) @label")
+        except Exception as e:
+            # Reported once per process: extract_assembly_symbols reuses a
+            # single cached instance.
+            logger.warning(
+                "Tree-sitter assembly parser not available (%s), "
+                "using regex-based parsing",
+                e,
             )
             self.parser = None
             self.language = None
+            self.label_query = None
+
+    def parse_file(self, file_path: str, repository_id: str) -> List[Dict]:
+        """Extract symbols from Assembly file as row dicts (ParseManager interface)"""
+        with open(file_path, "rb") as f:
+            source_bytes = f.read()
 
-    def parse_files(self, file_path: str, repository_id: str) -> List[Dict]:
-        """Extract symbols from Assembly file"""
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            source_code = f.read()
+        digest = _cache.content_digest(source_bytes)
+        cached = _cache.get(file_path, digest)
+        if cached is not None:
+            # Ids are never reused across parses
+            for symbol, symbol_id in zip(cached, uuid_batch(len(cached))):
+                symbol["symbol_id"] = symbol_id
+                symbol["repository_id"] = repository_id
+            return cached
+
+        source_code = source_bytes.decode("utf-8", errors="ignore")
+        symbols = [
+            asdict(sym) for sym in self.parse_source(source_code, file_path, repository_id)
+        ]
+        _cache.put(file_path, digest, symbols)
+        return symbols
+
+    def parse_source(
+        self, source_code: str, file_path: str, repository_id: str
+    ) -> List[AssemblySymbol]:
+        """Extract symbols from Assembly source already held in memory"""
         if self.parser:
             return self._parse_with_tree_sitter(
                 file_path, source_code.encode(), repository_id
@@ -34,106 +87,84 @@ class AssemblyParser:
 
     def _parse_with_regex(
         self, file_path: str, source_code: str, repository_id: str
-    ) -> List[Dict]:
+    ) -> List[AssemblySymbol]:
         """Fallback regex-based parsing for Assembly"""
-        symbols = []
-        lines = source_code.split("\n")
-        for line_num, line in enumerate(lines, 1):
-            line_stripped = line.strip()
-            label_match = re.match(
-                r"^([._a-zA-Z][._a-zA-Z0-9]*):(?!\s*;)", line_stripped
+        # One C-level sweep per pattern over the whole buffer; line numbers
+        # come from a bisect into the newline offsets.
+        newline_offsets = [m.start() for m in re.finditer(r"\n", source_code)]
+        found = []
+
+        for match in _LABEL_RE.finditer(source_code):
+            label_name = match.group(1)
+            if not label_name.startswith("L"):
+                found.append(
+                    (match.start(1), label_name, "function", f"{label_name}:")
+                )
+        for match in _SECTION_RE.finditer(source_code):
+            section_name = match.group(1)
+            found.append(
+                (match.start(1), section_name, "section", f".{section_name}")
             )
-            if label_match:
-                label_name = label_match.group(1)
-                if not label_name.startswith("L"):
-                    symbols.append(
-                        {
-                            "symbol_id": str(uuid.uuid4()),
-                            "name": label_name,
-                            "type": "function",
-                            "signature": f"{label_name}:",
-                            "file_path": file_path,
-                            "start_line": line_num,
-                            "end_line": line_num,
-                            "repository_id": repository_id,
-                        }
-                    )
-            section_match = re.match(
-                r"^\.(text|data|bss|rodata)(?:\s|$)", line_stripped
+        for match in _GLOBAL_RE.finditer(source_code):
+            symbol_name = match.group(2)
+            found.append(
+                (match.start(1), symbol_name, "global", f".global {symbol_name}")
             )
-            if section_match:
-                section_name = section_match.group(1)
-                symbols.append(
-                    {
-                        "symbol_id": str(uuid.uuid4()),
-                        "name": f"{section_name}",
-                        "type": "section",
-                        "signature": f".{section_name}",
-                        "file_path": file_path,
-                        "start_line": line_num,
-                        "end_line": line_num,
-                        "repository_id": repository_id,
-                    }
+
+        # Restore source order (the per-line scan emitted symbols in line order)
+        found.sort(key=lambda item: item[0])
+        symbols = []
+        symbol_ids = uuid_batch(len(found))
+        for offset, name, sym_type, signature in found:
+            line_num = bisect.bisect_left(newline_offsets, offset) + 1
+            symbols.append(
+                AssemblySymbol(
+                    symbol_id=next(symbol_ids),
+                    name=name,
+                    type=sym_type,
+                    signature=signature,
+                    file_path=file_path,
+                    start_line=line_num,
+                    end_line=line_num,
+                    repository_id=repository_id,
                 )
-            global_match = re.match(
-                r"^\.(globl|global)\s+([._a-zA-Z][._a-zA-Z0-9]*)", line_stripped
             )
-            if global_match:
-                symbol_name = global_match.group(2)
-                symbols.append(
-                    {
-                        "symbol_id": str(uuid.uuid4()),
-                        "name": symbol_name,
-                        "type": "global",
-                        "signature": f".global {symbol_name}",
-                        "file_path": file_path,
-                        "start_line": line_num,
-                        "end_line": line_num,
-                        "repository_id": repository_id,
-                    }
-                )
         return symbols
 
     def _parse_with_tree_sitter(
         self, file_path: str, source_code: bytes, repository_id: str
-    ) -> List[Dict]:
+    ) -> List[AssemblySymbol]:
         """Tree-sitter based parsing (when available)"""
         if self.parser is None:
             return []
         tree = self.parser.parse(source_code)
+        # One C-level query walk instead of a Python recursion over every node
+        labels = QueryCursor(self.label_query).captures(tree.root_node).get("label", [])
         symbols = []
-        self._extract_symbols(
-            tree.root_node, source_code, file_path, repository_id, symbols
-        )
-        return symbols
-
-    def _extract_symbols(
-        self,
-        node,
-        source_code: bytes,
-        file_path: str,
-        repository_id: str,
-        symbols: List[Dict],
-    ):
-        """Recursively extract Assembly symbols using tree-sitter"""
-        if node.type == "label":
+        symbol_ids = uuid_batch(len(labels))
+        for node in labels:
             name = (
                 source_code[node.start_byte : node.end_byte].decode("utf-8").strip(":")
             )
             symbols.append(
-                {
-                    "symbol_id": str(uuid.uuid4()),
-                    "name": name,
-                    "type": "function",
-                    "signature": f"{name}",
-                    "file_path": file_path,
-                    "start_line": node.start_point[0] + 1,
-                    "end_line": node.end_point[0] + 1,
-                    "repository_id": repository_id,
-                }
+                AssemblySymbol(
+                    symbol_id=next(symbol_ids),
+                    name=name,
+                    type="function",
+                    signature=f"{name}",
+                    file_path=file_path,
+                    start_line=node.start_point[0] + 1,
+                    end_line=node.end_point[0] + 1,
+                    repository_id=repository_id,
+                )
             )
-        for child in node.children:
-            self._extract_symbols(child, source_code, file_path, repository_id, symbols)
+        return symbols
+
+
+@functools.lru_cache(maxsize=1)
+def _get_assembly_parser() -> AssemblyParser:
+    """Build the AssemblyParser once per process (tree-sitter load is costly)."""
+    return AssemblyParser()
 
 
 def extract_assembly_symbols(source_code: str, filename: str) -> List[Dict]:
@@ -141,31 +172,23 @@ def extract_assembly_symbols(source_code: str, filename: str) -> List[Dict]:
     Wrapper function to extract Assembly symbols.
     Compatible with parse_repository.py interface.
     """
-    parser = AssemblyParser()
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".asm", delete=False) as f:
-        f.write(source_code)
-        temp_path = f.name
-
-    try:
-        symbols = parser.parse_files(temp_path, "temp")
-        result = []
-        type_mapping = {
-            "function": "function",
-            "section": "label",
-            "global": "function",
-        }
-        for sym in symbols:
-            original_type = sym["type"]
-            mapped_type = type_mapping.get(original_type, "function")
-            result.append(
-                {
-                    "name": sym["name"],
-                    "type": mapped_type,
-                    "line_start": sym["start_line"],
-                    "line_end": sym["end_line"],
-                    "signature": sym.get("signature", ""),
-                }
-            )
-        return result
-    finally:
-        os.unlink(temp_path)
+    parser = _get_assembly_parser()
+    symbols = parser.parse_source(source_code, filename, "temp")
+    result = []
+    type_mapping = {
+        "function": "function",
+        "section": "label",
+        "global": "function",
+    }
+    for sym in symbols:
+        mapped_type = type_mapping.get(sym.type, "function")
+        result.append(
+            {
+                "name": sym.name,
+                "type": mapped_type,
+                "line_start": sym.start_line,
+                "line_end": sym.end_line,
+                "signature": sym.signature,
+            }
+        )
+    return result
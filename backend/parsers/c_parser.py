@@ -1,118 +1,222 @@
-import uuid
-from typing import Dict, List
+import mmap
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tree_sitter import Parser, Query, QueryCursor
+
+from parsers import _cache
+from parsers._ids import uuid_batch
+from parsers._pool import get_pooled_parser
+from parsers.symbol_batch import SymbolBatch
 
 try:
-    from tree_sitter_languages import get_language, get_parser
+    from tree_sitter_languages import get_language
 
-    parser = get_parser("c")
     language = get_language("c")
-except Exception:
+except (ImportError, TypeError):
+    # TypeError: tree_sitter_languages' prebuilt grammars use the
+    # Language(path, name) constructor removed in py-tree-sitter 0.22
     import tree_sitter_c as tsc
-    from tree_sitter import Language, Parser
+    from tree_sitter import Language
 
     language = Language(tsc.language())
-    parser = Parser(language)
+
+
+def _get_parser() -> Parser:
+    """Return this thread's pooled C parser."""
+    return get_pooled_parser("c", lambda: Parser(language))
+
+
+# Integer node-kind ids, resolved once so checks compare ints, not strings
+_IDENTIFIER = language.id_for_node_kind("identifier", True)
+
+_SIGNATURE_MAX_BYTES = 101 * 4
+
+# Matched in one C-level pass; Python only sees the nodes it will index.
+# @body marks function bodies, whose local declarations are not indexed
+_SYMBOL_QUERY = Query(
+    language,
+    """
+    (function_definition declarator: (_)) @function
+    (struct_specifier name: (type_identifier)) @struct
+    (enum_specifier name: (type_identifier)) @enum
+    (function_definition body: (compound_statement) @body)
+    """,
+)
 
 
 def get_function_name(declarator_node, source_code: bytes) -> str:
-    """Recursively extract function name from declarator"""
-    if declarator_node.type == "identifier":
-        return source_code[
-            declarator_node.start_byte : declarator_node.end_byte
-        ].decode("utf-8")
+    """Extract function name by descending the declarator chain"""
+    node = declarator_node
+    while node is not None and node.kind_id != _IDENTIFIER:
+        node = node.child_by_field_name("declarator")
+    if node is None:
+        return "unknown"
+    return source_code[node.start_byte : node.end_byte].decode("utf-8")
+
 
-    declarator = declarator_node.child_by_field_name("declarator")
+def _handle_function(node, source_code: bytes, out: SymbolBatch):
+    declarator = node.child_by_field_name("declarator")
     if declarator:
-        return get_function_name(declarator, source_code)
-
-    return "unknown"
-
-
-def extract_symbols(node, source_code: bytes, symbols: List[Dict]):
-    """Recursively extract symbols from AST"""
-
-    if node.type == "function_definition":
-        declarator = node.child_by_field_name("declarator")
-        if declarator:
-            name = get_function_name(declarator, source_code)
-            full_text = source_code[node.start_byte : node.end_byte].decode(
-                "utf-8", errors="ignore"
-            )
-            first_line = full_text.split("\n")[0]
-            signature = (
-                (first_line[:100] + "...")
-                if len(first_line) > 100
-                else (first_line + " {...}")
-            )
-
-            symbols.append(
-                {
-                    "name": name,
-                    "type": "function",
-                    "signature": signature,
-                    "line_start": node.start_point[0] + 1,
-                    "line_end": node.end_point[0] + 1,
-                }
-            )
-
-    elif node.type == "struct_specifier":
-        name_node = node.child_by_field_name("name")
-        if name_node:
-            name = source_code[name_node.start_byte : name_node.end_byte].decode(
-                "utf-8"
-            )
-            symbols.append(
-                {
-                    "name": name,
-                    "type": "class_",
-                    "signature": f"struct {name}",
-                    "line_start": node.start_point[0] + 1,
-                    "line_end": node.end_point[0] + 1,
-                }
-            )
-
-    elif node.type == "enum_specifier":
-        name_node = node.child_by_field_name("name")
-        if name_node:
-            name = source_code[name_node.start_byte : name_node.end_byte].decode(
-                "utf-8"
-            )
-            symbols.append(
-                {
-                    "name": name,
-                    "type": "class_",
-                    "signature": f"enum {name}",
-                    "line_start": node.start_point[0] + 1,
-                    "line_end": node.end_point[0] + 1,
-                }
-            )
-
-    for child in node.children:
-        extract_symbols(child, source_code, symbols)
+        name = get_function_name(declarator, source_code)
+        # Decode only the first line, capped at the 101 characters the
+        # preview can show (at most 4 UTF-8 bytes each); never the body.
+        line_end = source_code.find(b"\n", node.start_byte, node.end_byte)
+        if line_end < 0:
+            line_end = node.end_byte
+        line_end = min(line_end, node.start_byte + _SIGNATURE_MAX_BYTES)
+        first_line = source_code[node.start_byte : line_end].decode(
+            "utf-8", errors="ignore"
+        )
+        signature = (
+            (first_line[:100] + "...")
+            if len(first_line) > 100
+            else (first_line + " {...}")
+        )
+
+        out.append(
+            name, "function", signature, node.start_point[0] + 1, node.end_point[0] + 1
+        )
+
+
+def _handle_tagged_type(node, source_code: bytes, out: SymbolBatch, keyword: str):
+    name_node = node.child_by_field_name("name")
+    if name_node:
+        name = source_code[name_node.start_byte : name_node.end_byte].decode("utf-8")
+        out.append(
+            name,
+            "class_",
+            f"{keyword} {name}",
+            node.start_point[0] + 1,
+            node.end_point[0] + 1,
+        )
+
+
+def _handle_struct(node, source_code: bytes, out: SymbolBatch):
+    _handle_tagged_type(node, source_code, out, "struct")
+
+
+def _handle_enum(node, source_code: bytes, out: SymbolBatch):
+    _handle_tagged_type(node, source_code, out, "enum")
+
+
+_HANDLERS = {
+    "function": _handle_function,
+    "struct": _handle_struct,
+    "enum": _handle_enum,
+}
+
+
+def extract_symbols(node, source_code: bytes, out: SymbolBatch):
+    """Extract symbols from the AST rooted at `node` into `out`"""
+    captures = QueryCursor(_SYMBOL_QUERY).captures(node)
+    bodies = sorted(
+        (body.start_byte, body.end_byte) for body in captures.pop("body", ())
+    )
+    matched = [
+        (captured, _HANDLERS[name])
+        for name, nodes in captures.items()
+        for captured in nodes
+    ]
+    # Document order, enclosing node first (as a pre-order walk emits them)
+    matched.sort(key=lambda item: (item[0].start_byte, -item[0].end_byte))
+
+    # Bodies are nested or disjoint, so a capture is local to a function
+    # exactly when it starts before the furthest end of the bodies opened
+    # so far; one sweep instead of an ancestor walk per capture
+    body_index = 0
+    body_end = -1
+    for captured, handler in matched:
+        start = captured.start_byte
+        while body_index < len(bodies) and bodies[body_index][0] <= start:
+            body_end = max(body_end, bodies[body_index][1])
+            body_index += 1
+        if start < body_end:
+            continue
+        handler(captured, source_code, out)
 
 
 def parse_c_file(file_path: str, repository_id: str | None = None) -> List[Dict]:
     """Parse C file and extract symbols"""
     with open(file_path, "rb") as f:
-        source_code = f.read()
-
-    tree = parser.parse(source_code)
-    symbols = []
-    extract_symbols(tree.root_node, source_code, symbols)
-
+        if os.fstat(f.fileno()).st_size == 0:
+            return _parse_c_source(b"", file_path, repository_id)
+        # Hash, parse and slice straight from the page cache; no heap copy
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source_code:
+            return _parse_c_source(source_code, file_path, repository_id)
+
+
+def _parse_c_source(
+    source_code: bytes | mmap.mmap, file_path: str, repository_id: str | None
+) -> List[Dict]:
+    digest = _cache.content_digest(source_code)
+    symbols = _cache.get(file_path, digest)
+    if symbols is None:
+        symbols = extract_c_symbol_batch(source_code).to_records()
+        _cache.put(file_path, digest, symbols)
+
+    # Ids are minted per call, never cached, so a hit still yields fresh rows
     if repository_id:
-        for symbol in symbols:
-            symbol["symbol_id"] = str(uuid.uuid4())
+        for symbol, symbol_id in zip(symbols, uuid_batch(len(symbols))):
+            symbol["symbol_id"] = symbol_id
             symbol["file_path"] = file_path
             symbol["repository_id"] = repository_id
 
     return symbols
 
 
+class CParser:
+    """Parser for C language"""
+
+    def parse_file(self, file_path: str, repository_id: str) -> List[Dict]:
+        """Extract symbols from C file"""
+        return parse_c_file(file_path, repository_id)
+
+
+def extract_c_symbol_batch(source_bytes: bytes | mmap.mmap) -> SymbolBatch:
+    """Extract symbols from C source bytes as columns"""
+    tree = _get_parser().parse(source_bytes)
+    batch = SymbolBatch()
+    extract_symbols(tree.root_node, source_bytes, batch)
+    return batch
+
+
 def extract_c_symbols(source_code: str, filename: str = "") -> List[Dict]:
     """Extract symbols from C source code string"""
-    source_bytes = source_code.encode("utf-8")
-    tree = parser.parse(source_bytes)
-    symbols = []
-    extract_symbols(tree.root_node, source_bytes, symbols)
-    return symbols
+    return extract_c_symbol_batch(source_code.encode("utf-8")).to_records()
+
+
+def _parse_one(args: Tuple[str, str | None]) -> List[Dict]:
+    """Process-pool worker: parse one file (picklable, module-level)."""
+    file_path, repository_id = args
+    try:
+        return parse_c_file(file_path, repository_id)
+    except Exception as e:
+        # One unreadable file must not fail the whole batch
+        print(f"❌ Error parsing {file_path}: {e}")
+        return []
+
+
+def parse_files_parallel(
+    paths: Iterable[str],
+    repository_id: str | None = None,
+    executor: Optional[Executor] = None,
+) -> List[List[Dict]]:
+    """
+    Parse many C files across worker processes, returning one symbol
+    list per path in input order. `executor` lets callers share one pool
+    between languages; without it a pool is started for this call.
+    """
+    paths = list(paths)
+    if not paths:
+        return []
+    if executor is None:
+        with ProcessPoolExecutor() as executor:
+            return parse_files_parallel(paths, repository_id, executor)
+    chunksize = max(1, len(paths) // (4 * (os.cpu_count() or 1)))
+    return list(
+        executor.map(
+            _parse_one, ((p, repository_id) for p in paths), chunksize=chunksize
+        )
+    )
@@ -1,37 +1,144 @@
+import functools
 import os
 import re
-import tempfile
-import uuid
-from typing import Dict, List
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AbstractSet, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from tree_sitter_languages import get_language, get_parser
+from tree_sitter import Tree
+from tree_sitter_languages import get_parser
+
+from parsers import _cache
+from parsers._pool import get_pooled_parser
+from parsers._walk import walk_nodes
+
+# Whole-buffer scan for the regex fallback: one finditer sweep in C instead
+# of a Python-level loop per line. Each alternative is anchored at a line
+# start after optional blanks ([^\S\n] = whitespace other than newline),
+# which reproduces matching against the stripped line; the alternatives
+# keep the PROGRAM-ID, SECTION, paragraph, 01-level check order.
+_COBOL_SYMBOL_RE = re.compile(
+    rb"^[^\S\n]*(?:"
+    rb"PROGRAM-ID\.[^\S\n]+(?P<prog>[A-Z0-9\-]+)"
+    rb"|(?P<sec>[A-Z][A-Z0-9\-]*)[^\S\n]+SECTION\."
+    rb"|(?P<para>[A-Z0-9][A-Z0-9\-]*)\.[^\S\n]*$"
+    rb"|01[^\S\n]+(?P<data>[A-Z0-9][A-Z0-9\-]+)"
+    rb")",
+    re.MULTILINE | re.IGNORECASE,
+)
+
+
+# Division/section headers that look like paragraphs but are not symbols
+_RESERVED_PARAGRAPHS = frozenset(
+    {
+        "IDENTIFICATION",
+        "ENVIRONMENT",
+        "DATA",
+        "PROCEDURE",
+        "WORKING-STORAGE",
+        "LINKAGE",
+        "FILE",
+        "SCREEN",
+        "INPUT-OUTPUT",
+        "FILE-CONTROL",
+        "CONFIGURATION",
+    }
+)
+
+
+def _new_cobol_parser():
+    """Build a tree-sitter COBOL parser, or None if the grammar is missing."""
+    try:
+        parser = get_parser("cobol")
+        print("✅ Tree-sitter COBOL parser loaded")
+        return parser
+    except Exception as e:
+        print(f"⚠️  Tree-sitter COBOL parser not available ({e}), using regex-based parsing")
+        return None
+
+
+def _point_at(source: bytes, offset: int) -> Tuple[int, int]:
+    """(row, column) of a byte offset, as tree-sitter edit points expect."""
+    row = source.count(b"\n", 0, offset)
+    column = offset - (source.rfind(b"\n", 0, offset) + 1)
+    return row, column
+
+
+# Block sizes for the prefix/suffix scans: whole pages first, then
+# narrowing down to the first differing byte
+_COMPARE_STEPS = (4096, 64, 1)
+
+
+def _common_prefix_len(a: bytes, b: bytes) -> int:
+    """Length of the shared prefix, comparing memoryview blocks (no copies)."""
+    n = min(len(a), len(b))
+    i = 0
+    with memoryview(a) as va, memoryview(b) as vb:
+        for step in _COMPARE_STEPS:
+            while i + step <= n and va[i : i + step] == vb[i : i + step]:
+                i += step
+    return i
+
+
+def _common_suffix_len(a: bytes, b: bytes, limit: int) -> int:
+    """Length of the shared suffix, at most `limit` bytes."""
+    end_a, end_b = len(a), len(b)
+    i = 0
+    with memoryview(a) as va, memoryview(b) as vb:
+        for step in _COMPARE_STEPS:
+            while (
+                i + step <= limit
+                and va[end_a - i - step : end_a - i] == vb[end_b - i - step : end_b - i]
+            ):
+                i += step
+    return i
 
 
 class CobolParser:
     """Parser for COBOL language"""
 
+    # Last (source, tree) per file, so a re-analysis reparses incrementally
+    TREE_CACHE_SIZE = 32
+
     def __init__(self):
-        try:
-            self.parser = get_parser("cobol")
-            self.language = get_language("cobol")
-            print("✅ Tree-sitter COBOL parser loaded")
-        except Exception as e:
-            print(f"⚠️  Tree-sitter COBOL parser not available ({e}), using regex-based parsing")
-            self.parser = None
-            self.language = None
+        self._tree_cache: "OrderedDict[str, Tuple[bytes, Tree]]" = OrderedDict()
+        self._tree_lock = threading.Lock()
+
+    @property
+    def parser(self):
+        """This thread's pooled tree-sitter parser (None -> regex fallback)."""
+        return get_pooled_parser("cobol", _new_cobol_parser)
 
     def parse_file(self, file_path: str, repository_id: str) -> List[Dict]:
         """Extract symbols from COBOL file"""
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            source_code = f.read()
-        
+        # tree-sitter and the regex fallback both work on bytes, so skip the
+        # decode/encode round trip; a CR before LF is just trailing blanks
+        with open(file_path, "rb") as f:
+            source_bytes = f.read()
+
+        digest = _cache.content_digest(source_bytes)
+        cached = _cache.get(file_path, digest)
+        if cached is not None:
+            for symbol in cached:
+                symbol["repository_id"] = repository_id
+            return cached
+
+        symbols = self.parse_source(source_bytes, file_path, repository_id)
+        _cache.put(file_path, digest, symbols)
+        return symbols
+
+    def parse_source(
+        self, source_bytes: bytes, file_path: str, repository_id: str
+    ) -> List[Dict]:
+        """Extract symbols from COBOL source already held in memory"""
         # Always try both methods and combine results
         symbols = []
         
         if self.parser:
             try:
                 ts_symbols = self._parse_with_tree_sitter(
-                    file_path, source_code.encode(), repository_id
+                    file_path, source_bytes, repository_id
                 )
                 symbols.extend(ts_symbols)
                 print(f"🌳 Tree-sitter found {len(ts_symbols)} symbols in {os.path.basename(file_path)}")
@@ -40,112 +147,103 @@ class CobolParser:
         
         # Fallback to regex if tree-sitter found nothing
         if not symbols:
-            regex_symbols = self._parse_with_regex(file_path, source_code, repository_id)
+            regex_symbols = self._parse_with_regex(file_path, source_bytes, repository_id)
             symbols.extend(regex_symbols)
             print(f"🔍 Regex found {len(regex_symbols)} symbols in {os.path.basename(file_path)}")
-        
+
         return symbols
 
     def _parse_with_regex(
-        self, file_path: str, source_code: str, repository_id: str
+        self, file_path: str, source_code: bytes, repository_id: str
     ) -> List[Dict]:
         """Fallback regex-based parsing for COBOL"""
-        symbols = []
-        lines = source_code.split("\n")
-        
-        for line_num, line in enumerate(lines, 1):
-            line_upper = line.upper().strip()
-            
-            # Skip empty lines and comments
-            if not line_upper or line_upper.startswith("*"):
-                continue
-            
-            # Extract PROGRAM-ID
-            program_match = re.match(r"PROGRAM-ID\.\s+([A-Z0-9\-]+)", line_upper)
-            if program_match:
-                name = program_match.group(1)
-                symbols.append(
-                    {
-                        "name": name,
-                        "type": "program",
-                        "signature": f"PROGRAM-ID. {name}",
-                        "file_path": file_path,
-                        "line_start": line_num,
-                        "line_end": line_num,
-                        "repository_id": repository_id,
-                    }
-                )
-                continue
-            
-            # Extract SECTION
-            section_match = re.match(r"^([A-Z][A-Z0-9\-]*)\s+SECTION\.", line_upper)
-            if section_match:
-                name = section_match.group(1)
-                symbols.append(
-                    {
+        return list(self._iter_regex_symbols(file_path, source_code, repository_id))
+
+    def _iter_regex_symbols(
+        self, file_path: str, source_code: bytes, repository_id: str
+    ) -> Iterator[Dict]:
+        """Yield regex-fallback symbols one at a time, in source order"""
+        line_num = 1
+        scanned = 0
+
+        for match in _COBOL_SYMBOL_RE.finditer(source_code):
+            # Matches arrive in order, so line numbers advance incrementally
+            line_num += source_code.count(b"\n", scanned, match.start())
+            scanned = match.start()
+            kind = match.lastgroup
+            name = match.group(kind).upper().decode("ascii")
+
+            if kind == "prog":
+                yield {
+                    "name": name,
+                    "type": "program",
+                    "signature": f"PROGRAM-ID. {name}",
+                    "file_path": file_path,
+                    "line_start": line_num,
+                    "line_end": line_num,
+                    "repository_id": repository_id,
+                }
+            elif kind == "sec":
+                yield {
+                    "name": name,
+                    "type": "procedure",
+                    "signature": f"{name} SECTION.",
+                    "file_path": file_path,
+                    "line_start": line_num,
+                    "line_end": line_num,
+                    "repository_id": repository_id,
+                }
+            elif kind == "para":
+                # Paragraph must end with a period and be standalone
+                if name not in _RESERVED_PARAGRAPHS:
+                    yield {
                         "name": name,
                         "type": "procedure",
-                        "signature": f"{name} SECTION.",
-                        "file_path": file_path,
-                        "line_start": line_num,
-                        "line_end": line_num,
-                        "repository_id": repository_id,
-                    }
-                )
-                continue
-            
-            # Extract PARAGRAPH (must end with a period and be standalone)
-            paragraph_match = re.match(r"^([A-Z0-9][A-Z0-9\-]*)\.\s*$", line_upper)
-            if paragraph_match:
-                name = paragraph_match.group(1)
-                # Exclude division/section names
-                if name not in [
-                    "IDENTIFICATION",
-                    "ENVIRONMENT",
-                    "DATA",
-                    "PROCEDURE",
-                    "WORKING-STORAGE",
-                    "LINKAGE",
-                    "FILE",
-                    "SCREEN",
-                    "INPUT-OUTPUT",
-                    "FILE-CONTROL",
-                    "CONFIGURATION",
-                ]:
-                    symbols.append(
-                        {
-                            "name": name,
-                            "type": "procedure",
-                            "signature": f"{name}.",
-                            "file_path": file_path,
-                            "line_start": line_num,
-                            "line_end": line_num,
-                            "repository_id": repository_id,
-                        }
-                    )
-                    continue
-            
-            # Extract 01-level data items (important variables)
-            data_match = re.match(
-                r"^\s*(01)\s+([A-Z0-9][A-Z0-9\-]+)",
-                line_upper,
-            )
-            if data_match:
-                level = data_match.group(1)
-                name = data_match.group(2)
-                symbols.append(
-                    {
-                        "name": name,
-                        "type": "variable",
-                        "signature": line.strip(),
+                        "signature": f"{name}.",
                         "file_path": file_path,
                         "line_start": line_num,
                         "line_end": line_num,
                         "repository_id": repository_id,
                     }
+            else:
+                # 01-level data items (important variables)
+                yield {
+                    "name": name,
+                    "type": "variable",
+                    "signature": self._line_at(source_code, match.start()),
+                    "file_path": file_path,
+                    "line_start": line_num,
+                    "line_end": line_num,
+                    "repository_id": repository_id,
+                }
+
+    @staticmethod
+    def _line_at(source_code: bytes, offset: int) -> str:
+        """Stripped text of the line starting at `offset`"""
+        line_end = source_code.find(b"\n", offset)
+        if line_end < 0:
+            line_end = len(source_code)
+        return source_code[offset:line_end].strip().decode("utf-8", errors="ignore")
+
+    def iter_source(
+        self, source_bytes: bytes, file_path: str, repository_id: str
+    ) -> Iterator[Dict]:
+        """
+        Like parse_source, but yields symbols so callers that batch them
+        (StreamingParser) never hold the regex fallback's full list.
+        """
+        if self.parser:
+            try:
+                ts_symbols = self._parse_with_tree_sitter(
+                    file_path, source_bytes, repository_id
                 )
-        
-        return symbols
+            except Exception as e:
+                print(f"⚠️  Tree-sitter failed for {file_path}: {e}")
+                ts_symbols = []
+            if ts_symbols:
+                yield from ts_symbols
+                return
+        yield from self._iter_regex_symbols(file_path, source_bytes, repository_id)
 
     def _parse_with_tree_sitter(
         self, file_path: str, source_code: bytes, repository_id: str
@@ -154,13 +252,57 @@ class CobolParser:
         if self.parser is None:
             return []
         
-        tree = self.parser.parse(source_code)
+        tree = self._parse_incremental(file_path, source_code)
+        # A paragraph's statements never declare symbols, so its subtree is
+        # skipped once the paragraph itself has been recorded
+        prune = frozenset({tree.language.id_for_node_kind("paragraph", True)})
         symbols = []
         self._extract_symbols(
-            tree.root_node, source_code, file_path, repository_id, symbols
+            tree.root_node, source_code, file_path, repository_id, symbols, prune
         )
         return symbols
 
+    def _parse_incremental(self, file_path: str, source_code: bytes) -> Tree:
+        """
+        Parse `source_code`, reusing the previous tree for `file_path` when
+        there is one: the changed byte range (common prefix/suffix diff) is
+        applied with Tree.edit so tree-sitter only re-lexes what changed.
+        """
+        # Take the entry out while using it: Tree.edit mutates in place
+        with self._tree_lock:
+            previous = self._tree_cache.pop(file_path, None)
+
+        if previous is None:
+            tree = self.parser.parse(source_code)
+        else:
+            old_source, old_tree = previous
+            if old_source == source_code:
+                tree = old_tree
+            else:
+                start = _common_prefix_len(old_source, source_code)
+                suffix = _common_suffix_len(
+                    old_source,
+                    source_code,
+                    min(len(old_source), len(source_code)) - start,
+                )
+                old_end = len(old_source) - suffix
+                new_end = len(source_code) - suffix
+                old_tree.edit(
+                    start_byte=start,
+                    old_end_byte=old_end,
+                    new_end_byte=new_end,
+                    start_point=_point_at(old_source, start),
+                    old_end_point=_point_at(old_source, old_end),
+                    new_end_point=_point_at(source_code, new_end),
+                )
+                tree = self.parser.parse(source_code, old_tree)
+
+        with self._tree_lock:
+            self._tree_cache[file_path] = (source_code, tree)
+            while len(self._tree_cache) > self.TREE_CACHE_SIZE:
+                self._tree_cache.popitem(last=False)
+        return tree
+
     def _extract_symbols(
         self,
         node,
@@ -168,97 +310,133 @@ class CobolParser:
         file_path: str,
         repository_id: str,
         symbols: List[Dict],
+        prune: AbstractSet[int] = frozenset(),
     ):
-        """Recursively extract COBOL symbols using tree-sitter"""
-        
+        """Extract COBOL symbols from the tree-sitter AST rooted at `node`"""
+        for child in walk_nodes(node, prune):
+            self._extract_node(child, source_code, file_path, repository_id, symbols)
+
+    def _extract_node(
+        self,
+        node,
+        source_code: bytes,
+        file_path: str,
+        repository_id: str,
+        symbols: List[Dict],
+    ):
+        """Append the COBOL symbol declared by a single node, if any"""
+        # Each node property crosses into the C binding, so read it once
+        node_type = node.type
+        name = None
+
         # Extract program_id
-        if node.type == "program_id":
+        if node_type == "program_id":
             name_node = node.named_children[0] if node.named_children else None
             if name_node:
                 name = source_code[name_node.start_byte : name_node.end_byte].decode(
                     "utf-8"
                 ).strip()
-                symbols.append(
-                    {
-                        "name": name,
-                        "type": "program",
-                        "signature": f"PROGRAM-ID. {name}",
-                        "file_path": file_path,
-                        "line_start": node.start_point[0] + 1,
-                        "line_end": node.end_point[0] + 1,
-                        "repository_id": repository_id,
-                    }
-                )
+                symbol_type, signature = "program", f"PROGRAM-ID. {name}"
         
         # Extract paragraphs
-        elif node.type == "paragraph":
+        elif node_type == "paragraph":
             for child in node.children:
                 if child.type == "paragraph_name":
                     name = source_code[child.start_byte : child.end_byte].decode(
                         "utf-8"
                     ).strip()
-                    symbols.append(
-                        {
-                            "name": name,
-                            "type": "procedure",
-                            "signature": f"{name}.",
-                            "file_path": file_path,
-                            "line_start": node.start_point[0] + 1,
-                            "line_end": node.end_point[0] + 1,
-                            "repository_id": repository_id,
-                        }
-                    )
+                    symbol_type, signature = "procedure", f"{name}."
                     break
         
         # Extract sections
-        elif node.type == "section":
+        elif node_type == "section":
             for child in node.children:
                 if child.type == "section_name":
                     name = source_code[child.start_byte : child.end_byte].decode(
                         "utf-8"
                     ).strip()
-                    symbols.append(
-                        {
-                            "name": name,
-                            "type": "procedure",
-                            "signature": f"{name} SECTION.",
-                            "file_path": file_path,
-                            "line_start": node.start_point[0] + 1,
-                            "line_end": node.end_point[0] + 1,
-                            "repository_id": repository_id,
-                        }
-                    )
+                    symbol_type, signature = "procedure", f"{name} SECTION."
                     break
         
         # Extract data declarations (01 level)
-        elif node.type == "data_description":
+        elif node_type == "data_description":
             level_node = None
             name_node = None
             for child in node.children:
-                if child.type == "level_number" and child.text and child.text.decode("utf-8").strip() == "01":
+                child_type = child.type
+                if child_type == "level_number" and child.text and child.text.decode("utf-8").strip() == "01":
                     level_node = child
-                elif child.type in ["data_name", "identifier"]:
+                elif child_type in ("data_name", "identifier"):
                     name_node = child
             
             if level_node and name_node:
                 name = source_code[name_node.start_byte : name_node.end_byte].decode(
                     "utf-8"
                 ).strip()
-                symbols.append(
-                    {
-                        "name": name,
-                        "type": "variable",
-                        "signature": source_code[node.start_byte : node.end_byte].decode("utf-8").strip()[:100],
-                        "file_path": file_path,
-                        "line_start": node.start_point[0] + 1,
-                        "line_end": node.end_point[0] + 1,
-                        "repository_id": repository_id,
-                    }
-                )
-        
-        # Recurse through all children
-        for child in node.children:
-            self._extract_symbols(child, source_code, file_path, repository_id, symbols)
+                symbol_type = "variable"
+                signature = source_code[node.start_byte : node.end_byte].decode("utf-8").strip()[:100]
+
+        if name is None:
+            return
+        symbols.append(
+            {
+                "name": name,
+                "type": symbol_type,
+                "signature": signature,
+                "file_path": file_path,
+                "line_start": node.start_point[0] + 1,
+                "line_end": node.end_point[0] + 1,
+                "repository_id": repository_id,
+            }
+        )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_cobol_parser() -> CobolParser:
+    """Build the CobolParser once per process."""
+    return CobolParser()
+
+
+def _parse_one(args: Tuple[str, str]) -> List[Dict]:
+    """Process-pool worker: parse one file (picklable, module-level)."""
+    file_path, repository_id = args
+    try:
+        return _get_cobol_parser().parse_file(file_path, repository_id)
+    except Exception as e:
+        # One unreadable file must not fail the whole batch
+        print(f"❌ Error parsing {file_path}: {e}")
+        return []
+
+
+def parse_files_parallel(
+    paths: Iterable[str],
+    repository_id: str,
+    executor: Optional[Executor] = None,
+) -> List[List[Dict]]:
+    """
+    Parse many COBOL files across worker processes, returning one symbol
+    list per path in input order. `executor` lets callers share one pool
+    between languages; without it a pool is started for this call.
+    """
+    paths = list(paths)
+    if not paths:
+        return []
+    if executor is None:
+        with ProcessPoolExecutor() as executor:
+            return parse_files_parallel(paths, repository_id, executor)
+    chunksize = max(1, len(paths) // (4 * (os.cpu_count() or 1)))
+    return list(
+        executor.map(
+            _parse_one, ((p, repository_id) for p in paths), chunksize=chunksize
+        )
+    )
+
+
+def iter_cobol_symbols(source_code: str, filename: str) -> Iterator[Dict]:
+    """Generator counterpart of extract_cobol_symbols for batched consumers."""
+    return _get_cobol_parser().iter_source(
+        source_code.encode("utf-8", errors="ignore"), filename, "temp"
+    )
 
 
 def extract_cobol_symbols(source_code: str, filename: str) -> List[Dict]:
@@ -266,13 +444,6 @@ def extract_cobol_symbols(source_code: str, filename: str) -> List[Dict]:
     Wrapper function to extract COBOL symbols.
     Compatible with generic parser interface.
     """
-    parser = CobolParser()
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".cob", delete=False) as f:
-        f.write(source_code)
-        temp_path = f.name
-
-    try:
-        symbols = parser.parse_file(temp_path, "temp")
-        return symbols
-    finally:
-        os.unlink(temp_path)
+    return _get_cobol_parser().parse_source(
+        source_code.encode("utf-8", errors="ignore"), filename, "temp"
+    )
@@ -1,28 +1,40 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from parsers.assembly_parser import AssemblyParser
 from parsers.c_parser import CParser
+from parsers.c_parser import parse_files_parallel as parse_c_files_parallel
 from parsers.cobol_parser import CobolParser
+from parsers.cobol_parser import parse_files_parallel as parse_cobol_files_parallel
 from parsers.python_parser import PythonParser
 
 
 class ParseManager:
     """Manages multi-language code parsing"""
 
-    def __init__(self):
-        self.parsers = {
-            ".py": PythonParser(),
-            ".c": CParser(),
-            ".h": CParser(),
-            ".asm": AssemblyParser(),
-            ".s": AssemblyParser(),
-            ".S": AssemblyParser(),
-            ".cbl": CobolParser(),
-            ".cob": CobolParser(),
-            ".cpy": CobolParser(),
-        }
+    # Extension -> attribute holding that language's parser
+    _PARSER_ATTRS = {
+        ".py": "python_parser",
+        ".c": "c_parser",
+        ".h": "c_parser",
+        ".asm": "assembly_parser",
+        ".s": "assembly_parser",
+        ".S": "assembly_parser",
+        ".cbl": "cobol_parser",
+        ".cob": "cobol_parser",
+        ".cpy": "cobol_parser",
+    }
 
+    # Parser attribute -> that language's module-level batch parser
+    _BATCH_PARSERS = {
+        "c_parser": parse_c_files_parallel,
+        "cobol_parser": parse_cobol_files_parallel,
+    }
+
+    def __init__(self):
         self.language_map = {
             ".py": "python",
             ".c": "c",
@@ -35,6 +47,24 @@ class ParseManager:
             ".cpy": "cobol",
         }
 
+    # Built on first use, one instance per language, so languages a
+    # repository does not contain never load their tree-sitter grammar.
+    @cached_property
+    def python_parser(self) -> PythonParser:
+        return PythonParser()
+
+    @cached_property
+    def c_parser(self) -> CParser:
+        return CParser()
+
+    @cached_property
+    def assembly_parser(self) -> AssemblyParser:
+        return AssemblyParser()
+
+    @cached_property
+    def cobol_parser(self) -> CobolParser:
+        return CobolParser()
+
     def get_language_from_extension(self, file_path: str) -> str:
         """Detect language from file extension"""
         ext = Path(file_path).suffix.lower()
@@ -43,8 +73,9 @@ class ParseManager:
     def parse_file(self, file_path: str, repository_id: str) -> List[Dict]:
         """Parse file based on extension"""
         ext = Path(file_path).suffix.lower()
-        parser = self.parsers.get(ext)
-        if parser:
+        attr = self._PARSER_ATTRS.get(ext)
+        if attr:
+            parser = getattr(self, attr)
             try:
                 return parser.parse_file(file_path, repository_id)
             except Exception as e:
@@ -55,8 +86,62 @@ class ParseManager:
 
     def supported_extensions(self) -> List[str]:
         """Get list of supported file extensions"""
-        return list(self.parsers.keys())
+        return list(self._PARSER_ATTRS.keys())
 
     def supported_languages(self) -> List[str]:
         """Get list of supported file extensions"""
         return list(set(self.language_map.values()))
+
+    def parse_files_parallel(
+        self, paths: Iterable[str], repository_id: str
+    ) -> Dict[str, List[Dict]]:
+        """
+        Parse many files across one process pool; returns {path: symbols}
+        for every path with a parser. C and COBOL go through their modules'
+        batch parsers on that pool. Other files are parsed by a ParseManager
+        each worker builds once, rather than receiving this one pickled.
+        Must not be called from a daemonic process (e.g. a prefork Celery
+        child), which cannot start a pool.
+        """
+        by_attr: Dict[str, List[str]] = {}
+        for path in paths:
+            attr = self._PARSER_ATTRS.get(Path(path).suffix.lower())
+            if attr:
+                by_attr.setdefault(attr, []).append(path)
+        parsed: Dict[str, List[Dict]] = {}
+        if not by_attr:
+            return parsed
+        workers = os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Languages without a batch parser are submitted first and
+            # collected last, so their files parse while the batch parsers
+            # wait on their own results
+            pending = []
+            for attr, group in sorted(
+                by_attr.items(), key=lambda item: item[0] in self._BATCH_PARSERS
+            ):
+                batch_parser = self._BATCH_PARSERS.get(attr)
+                if batch_parser is not None:
+                    results = batch_parser(group, repository_id, executor)
+                    parsed.update(zip(group, results))
+                    continue
+                chunksize = max(1, len(group) // (4 * workers))
+                results = executor.map(
+                    _parse_one, ((p, repository_id) for p in group), chunksize=chunksize
+                )
+                pending.append((group, results))
+            for group, results in pending:
+                parsed.update(zip(group, results))
+        return parsed
+
+
+@lru_cache(maxsize=1)
+def _worker_manager() -> ParseManager:
+    """The ParseManager of the current (worker) process."""
+    return ParseManager()
+
+
+def _parse_one(args: Tuple[str, str]) -> List[Dict]:
+    """Process-pool worker: parse one file (picklable, module-level)."""
+    file_path, repository_id = args
+    return _worker_manager().parse_file(file_path, repository_id)
@@ -1,8 +1,15 @@
 import ast
-from typing import Dict, List
+from collections import deque
+from typing import Dict, Iterator, List
 
+from parsers import _cache
 
-def _get_function_signature(node: ast.FunctionDef) -> str:
+
+# Node types that can hold statements (and so nested definitions)
+_STATEMENT_CONTAINERS = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def _get_function_signature(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
     """Generate function signature string"""
     args = []
     for arg in node.args.args:
@@ -11,7 +18,56 @@ def _get_function_signature(node: ast.FunctionDef) -> str:
         args.append(f"*{node.args.vararg.arg}")
     if node.args.kwarg:
         args.append(f"**{node.args.kwarg.arg}")
-    return f"def {node.name}({', '.join(args)})"
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    return f"{prefix} {node.name}({', '.join(args)})"
+
+
+def _iter_definitions(tree: ast.Module):
+    """
+    Yield function and class definitions breadth-first, like ast.walk,
+    but only descending through statement lists: definitions never occur
+    inside expressions, so expression subtrees are never visited.
+    """
+    queue = deque([tree])
+    while queue:
+        node = queue.popleft()
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list) and value and isinstance(
+                value[0], _STATEMENT_CONTAINERS
+            ):
+                queue.extend(value)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            yield node
+
+
+def iter_python_symbols(source_code: str, filename: str) -> Iterator[Dict]:
+    """Yield functions and classes from Python source one at a time."""
+    try:
+        tree = ast.parse(source_code, filename=filename)
+    except SyntaxError as e:
+        print(f"Syntax error in {filename}: {e}")
+        return
+    except Exception as e:
+        print(f"Error parsing {filename}: {e}")
+        return
+    for node in _iter_definitions(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield {
+                "name": node.name,
+                "type": "function",
+                "line_start": node.lineno,
+                "line_end": node.end_lineno or node.lineno,
+                "signature": _get_function_signature(node),
+            }
+        elif isinstance(node, ast.ClassDef):
+            yield {
+                "name": node.name,
+                "type": "class_",
+                "line_start": node.lineno,
+                "line_end": node.end_lineno or node.lineno,
+                "signature": f"class {node.name}",
+            }
 
 
 def extract_python_symbols(source_code: str, filename: str) -> List[Dict]:
@@ -25,32 +81,26 @@ def extract_python_symbols(source_code: str, filename: str) -> List[Dict]:
     Returns:
         List of dictionaries containing symbol information
     """
-    symbols = []
-    try:
-        tree = ast.parse(source_code, filename=filename)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                symbols.append(
-                    {
-                        "name": node.name,
-                        "type": "function",
-                        "line_start": node.lineno,
-                        "line_end": node.end_lineno or node.lineno,
-                        "signature": _get_function_signature(node),
-                    }
-                )
-            elif isinstance(node, ast.ClassDef):
-                symbols.append(
-                    {
-                        "name": node.name,
-                        "type": "class_",
-                        "line_start": node.lineno,
-                        "line_end": node.end_lineno or node.lineno,
-                        "signature": f"class {node.name}",
-                    }
-                )
-    except SyntaxError as e:
-        print(f"Syntax error in {filename}: {e}")
-    except Exception as e:
-        print(f"Error parsing {filename}: {e}")
-    return symbols
+    return list(iter_python_symbols(source_code, filename))
+
+
+class PythonParser:
+    """Parser for Python language"""
+
+    def parse_file(self, file_path: str, repository_id: str) -> List[Dict]:
+        """Extract symbols from Python file"""
+        with open(file_path, "rb") as f:
+            source_bytes = f.read()
+
+        digest = _cache.content_digest(source_bytes)
+        symbols = _cache.get(file_path, digest)
+        if symbols is None:
+            symbols = extract_python_symbols(
+                source_bytes.decode("utf-8", errors="ignore"), file_path
+            )
+            _cache.put(file_path, digest, symbols)
+
+        for symbol in symbols:
+            symbol["file_path"] = file_path
+            symbol["repository_id"] = repository_id
+        return symbols
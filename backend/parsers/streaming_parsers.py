@@ -4,16 +4,17 @@ Batches DB inserts to avoid memory spikes.
 Uses the same parser functions as parse_repository.py.
 """
 
+import mmap
 import os
-from typing import Dict, Generator, List
+from typing import Dict, Generator, List, Optional, Tuple
 
 from parsers.assembly_parser import extract_assembly_symbols
 from parsers.c_parser import extract_c_symbols
-from parsers.cobol_parser import extract_cobol_symbols
-from parsers.python_parser import extract_python_symbols
+from parsers.cobol_parser import iter_cobol_symbols
+from parsers.python_parser import iter_python_symbols
 
 LANGUAGE_CONFIG = {
-    "python": {".py": extract_python_symbols},
+    "python": {".py": iter_python_symbols},
     "c": {".c": extract_c_symbols, ".h": extract_c_symbols},
     "assembly": {
         ".asm": extract_assembly_symbols,
@@ -21,10 +22,10 @@ LANGUAGE_CONFIG = {
         ".S": extract_assembly_symbols,
     },
     "cobol": {
-        ".cob": extract_cobol_symbols,
-        ".cbl": extract_cobol_symbols,
-        ".COB": extract_cobol_symbols,
-        ".CBL": extract_cobol_symbols,
+        ".cob": iter_cobol_symbols,
+        ".cbl": iter_cobol_symbols,
+        ".COB": iter_cobol_symbols,
+        ".CBL": iter_cobol_symbols,
     },
 }
 
@@ -35,6 +36,29 @@ for lang, ext_map in LANGUAGE_CONFIG.items():
 
 LINE_THRESHOLD = 100_000
 BATCH_SIZE = 1_000
+COUNT_CHUNK_SIZE = 1 << 20
+
+
+def count_lines(file_path: str, limit: Optional[int] = None) -> int:
+    """
+    Count lines the way iterating a text file would (a final line without
+    a trailing newline still counts), via a memory map scanned in 1 MiB
+    chunks so newlines are counted in C. Stops early once the count
+    exceeds `limit`.
+    """
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            count = 0
+            for pos in range(0, size, COUNT_CHUNK_SIZE):
+                count += mm[pos : pos + COUNT_CHUNK_SIZE].count(b"\n")
+                if limit is not None and count > limit:
+                    return count
+            if mm[size - 1] != 0x0A:
+                count += 1
+            return count
 
 
 class StreamingParser:
@@ -43,27 +67,46 @@ class StreamingParser:
     def should_stream(self, file_path: str) -> bool:
         """Return True if file has more than LINE_THRESHOLD lines."""
         try:
-            count = 0
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                for _ in f:
-                    count += 1
-                    if count > LINE_THRESHOLD:
-                        return True
-            return False
+            return count_lines(file_path, limit=LINE_THRESHOLD) > LINE_THRESHOLD
         except Exception:
             return False
 
+    def open_and_classify(self, file_path: str) -> Tuple[Dict, Optional[str]]:
+        """
+        Read a file once and return (stats, source), with stats shaped like
+        get_file_stats, so the size check and the parse share a single read
+        instead of scanning twice. ({}, None) if the file can't be read.
+        """
+        try:
+            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                size_bytes = os.fstat(f.fileno()).st_size
+                source = f.read()
+        except Exception:
+            return {}, None
+        line_count = source.count("\n")
+        if source and not source.endswith("\n"):
+            line_count += 1
+        parser_info = self.get_parser_for_file(file_path)
+        stats = {
+            "line_count": line_count,
+            "size_bytes": size_bytes,
+            "is_large": line_count > LINE_THRESHOLD,
+            "language": parser_info[0] if parser_info else "unknown",
+        }
+        return stats, source
+
     def get_parser_for_file(self, file_path: str):
         """Return (language, parser_func) for a given file path, or None."""
         ext = os.path.splitext(file_path)[1]
         return EXTENSION_MAP.get(ext)
 
     def parse_in_batches(
-        self, file_path: str, repository_id: str
+        self, file_path: str, repository_id: str, source: Optional[str] = None
     ) -> Generator[List[Dict], None, None]:
         """
         Parse a large file and yield symbols in batches of BATCH_SIZE.
         Uses the same parser functions as parse_repository.py.
+        Pass `source` (e.g. from open_and_classify) to skip re-reading.
         """
         parser_info = self.get_parser_for_file(file_path)
         if not parser_info:
@@ -73,11 +116,18 @@ class StreamingParser:
         language, parser_func = parser_info
 
         try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                source = f.read()
-            symbols = parser_func(source, file_path)
-            for i in range(0, len(symbols), BATCH_SIZE):
-                yield symbols[i : i + BATCH_SIZE]
+            if source is None:
+                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                    source = f.read()
+            # Parsers may be generators; only one batch is held at a time
+            batch = []
+            for symbol in parser_func(source, file_path):
+                batch.append(symbol)
+                if len(batch) >= BATCH_SIZE:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
 
         except Exception as e:
             print(f"❌ StreamingParser error on {file_path}: {e}")
@@ -86,10 +136,7 @@ class StreamingParser:
     def get_file_stats(self, file_path: str) -> Dict:
         """Return basic stats about a file."""
         try:
-            line_count = 0
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                for _ in f:
-                    line_count += 1
+            line_count = count_lines(file_path)
             size_bytes = os.path.getsize(file_path)
             ext = os.path.splitext(file_path)[1]
             parser_info = EXTENSION_MAP.get(ext)
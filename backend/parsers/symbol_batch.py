@@ -0,0 +1,63 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+
+@dataclass
+class SymbolBatch:
+    """Extracted symbols stored column-wise (one list per field)"""
+
+    names: List[str] = field(default_factory=list)
+    types: List[str] = field(default_factory=list)
+    signatures: List[Optional[str]] = field(default_factory=list)
+    line_starts: List[int] = field(default_factory=list)
+    line_ends: List[Optional[int]] = field(default_factory=list)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "SymbolBatch":
+        """Columnize row dicts (AoS -> SoA), applying the usual defaults"""
+        batch = cls()
+        for record in records:
+            batch.append(
+                record.get("name", "unknown"),
+                (record.get("type") or "").strip(),
+                record.get("signature"),
+                record.get("line_start", 1),
+                record.get("line_end"),
+            )
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def append(
+        self,
+        name: str,
+        type_: str,
+        signature: Optional[str],
+        line_start: int,
+        line_end: Optional[int],
+    ) -> None:
+        self.names.append(name)
+        self.types.append(type_)
+        self.signatures.append(signature)
+        self.line_starts.append(line_start)
+        self.line_ends.append(line_end)
+
+    def to_rows(self) -> List[tuple]:
+        """(name, type, signature, line_start, line_end) tuples for executemany"""
+        return list(
+            zip(self.names, self.types, self.signatures, self.line_starts, self.line_ends)
+        )
+
+    def to_records(self) -> List[Dict]:
+        """Row dicts in the shape the parsers have always returned"""
+        return [
+            {
+                "name": name,
+                "type": type_,
+                "signature": signature,
+                "line_start": line_start,
+                "line_end": line_end,
+            }
+            for name, type_, signature, line_start, line_end in self.to_rows()
+        ]
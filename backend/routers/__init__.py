@@ -1,24 +1,35 @@
-from .ai_assistant import router as ai_assistant_router
-from .analysis import router as analysis_router
-from .chat import router as chat_router
-from .cicd import router as cicd_router
-from .github import router as github_router
-from .metrics import router as metrics_router
-from .recommendations import router as recommendations_router
-from .repositories import router as repositories_router
-from .security import router as security_router
-from .upload import router as upload_router
+"""
+Router registry. Each `<name>_router` is imported from its submodule on
+first access (PEP 562), so importing one submodule such as
+routers.metrics does not initialize every other router (and openai).
+"""
 
-__all__ = [
-    "upload_router",
-    "repositories_router",
-    "repositories_router",
-    "recommendations_router",
-    "github_router",
-    "security_router",
-    "ai_assistant_router",
-    "chat_router",
-    "analysis_router",
-    "metrics_router",
-    "cicd_router",
-]
+import importlib
+
+_ROUTER_MODULES = {
+    "ai_assistant_router": "ai_assistant",
+    "analysis_router": "analysis",
+    "chat_router": "chat",
+    "cicd_router": "cicd",
+    "github_router": "github",
+    "metrics_router": "metrics",
+    "recommendations_router": "recommendations",
+    "repositories_router": "repositories",
+    "security_router": "security",
+    "upload_router": "upload",
+}
+
+__all__ = sorted(_ROUTER_MODULES)
+
+
+def __getattr__(name: str):
+    module_name = _ROUTER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    router = importlib.import_module(f".{module_name}", __name__).router
+    globals()[name] = router
+    return router
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,18 +3,19 @@ Sprint 12: AI Code Completion & Assistant
 Provides explain, translate, refactor, generate, and autocomplete features.
 """
 
-import json
 from typing import List, Optional
 
+import orjson
 from fastapi import APIRouter, HTTPException
-from openai import OpenAI
+from openai import AsyncOpenAI
 from pydantic import BaseModel
 
 from config import settings
+from utils.cache import cache
 
 router = APIRouter(prefix="/api/ai", tags=["ai-assistant"])
 
-client = OpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
+client = AsyncOpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
 
 
 class ExplainRequest(BaseModel):
@@ -75,18 +76,16 @@ class AutocompleteResponse(BaseModel):
     suggestions: List[dict]
 
 
-def _call_openai(
+async def _request_completion(
     system_prompt: str,
     user_prompt: str,
-    model: str = "gpt-4o-mini",
-    temperature: float = 0.3,
-    max_tokens: int = 2000,
+    model: str,
+    temperature: float,
+    max_tokens: int,
 ) -> dict:
-    """Unified OpenAI API caller with error handling."""
-    if not client:
-        raise HTTPException(status_code=503, detail="OpenAI API key not configured")
+    """Send one chat completion request and parse its JSON body."""
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -99,12 +98,36 @@ def _call_openai(
         content = response.choices[0].message.content
         if content is None:
             raise HTTPException(status_code=500, detail="AI returned empty response")
-        return json.loads(content)
+        return orjson.loads(content)
     except Exception as e:
         print(f"❌ OpenAI API Error: {e}")
         raise HTTPException(status_code=500, detail=f"AI request failed: {str(e)}")
 
 
+# Low-temperature completions are close to deterministic, so repeated
+# prompts (e.g. debounced autocomplete) are answered from Redis
+_cached_completion = cache(expire=3600, prefix="ai_assistant")(_request_completion)
+CACHE_MAX_TEMPERATURE = 0.5
+
+
+async def _call_openai(
+    system_prompt: str,
+    user_prompt: str,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.3,
+    max_tokens: int = 2000,
+) -> dict:
+    """Unified OpenAI API caller with error handling."""
+    if not client:
+        raise HTTPException(status_code=503, detail="OpenAI API key not configured")
+    if temperature > CACHE_MAX_TEMPERATURE:
+        completion = _request_completion
+    else:
+        completion = _cached_completion
+    # Positional arguments keep the cache key independent of call style
+    return await completion(system_prompt, user_prompt, model, temperature, max_tokens)
+
+
 @router.post("/explain", response_model=ExplainResponse)
 async def explain_code(request: ExplainRequest):
     """
@@ -140,7 +163,7 @@ Format as JSON:
 "suggestions": ["Consider memoization", "Add input validation"]
 }}
 """
-    result = _call_openai(system_prompt, user_prompt, temperature=0.3)
+    result = await _call_openai(system_prompt, user_prompt, temperature=0.3)
     return ExplainResponse(**result)
 
 
@@ -181,7 +204,7 @@ Return JSON:
 "notes": ["Added header includes", "Changed loop syntax"]
 }}
 """
-    result = _call_openai(system_prompt, user_prompt, temperature=0.2)
+    result = await _call_openai(system_prompt, user_prompt, temperature=0.2)
     return TranslateResponse(**result)
 
 
@@ -224,7 +247,7 @@ Format as JSON:
 "rationale": "Improved naming makes the function's purpose clearer..."
 }}
 """
-    result = _call_openai(system_prompt, user_prompt, temperature=0.3, max_tokens=3000)
+    result = await _call_openai(system_prompt, user_prompt, temperature=0.3, max_tokens=3000)
     return RefactorResponse(**result)
 
 
@@ -262,10 +285,18 @@ Return JSON:
 "explanation": "Brief explanation of the approach and key decisions"
 }}
 """
-    result = _call_openai(system_prompt, user_prompt, temperature=0.4, max_tokens=3000)
+    result = await _call_openai(system_prompt, user_prompt, temperature=0.4, max_tokens=3000)
     return GenerateResponse(**result)
 
 
+def _lines_before(text: str, stop: int, count: int) -> str:
+    """
+    The `count` lines ending just before 0-based line `stop` (>= 0). The
+    split stops at the cursor, so the lines after it are never split out.
+    """
+    return "\n".join(text.split("\n", stop)[max(0, stop - count) : stop])
+
+
 @router.post("/autocomplete", response_model=AutocompleteResponse)
 async def autocomplete_code(request: AutocompleteRequest):
     """
@@ -282,9 +313,9 @@ async def autocomplete_code(request: AutocompleteRequest):
     }
     ```
     """
-    lines = request.code.split("\n")
-    context_lines = lines[max(0, request.cursor_line - 10) : request.cursor_line]
-    context = "\n".join(context_lines)
+    if request.cursor_line < 0:
+        raise HTTPException(status_code=400, detail="cursor_line must be >= 0")
+    context = _lines_before(request.code, request.cursor_line, 10)
     system_prompt = "You are an AI code completion assistant. Suggest 1-3 intelligent completions based on context."
     user_prompt = f"""Given this {request.language} code, suggest the next completion(s):
     {context}
@@ -299,7 +330,7 @@ Return JSON:
 }}
 """
     try:
-        result = _call_openai(
+        result = await _call_openai(
             system_prompt,
             user_prompt,
             model="gpt-4o-mini",
@@ -1,118 +1,377 @@
 """Advanced Analysis Endpoints - Sprint 9"""
 
+import asyncio
+import hashlib
+import logging
+import mmap
+import multiprocessing
+import os
 import uuid
-from typing import Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
-from sqlalchemy import delete
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from celery_app import celery_app
 from database import SessionLocal, get_db
 from models import CodeDuplication, CodeSmell, File, Repository, SmellSeverity, Symbol
 from models.code_smell import SmellType
 from models.symbol import SymbolType
 from services.auto_documentation import AutoDocumentationService
-from services.code_smell_detector import CodeSmellDetector
-from services.duplication_scanner import DuplicateScanner
+from services.code_smell_detector import CodeSmellDetector, SmellFinding
+from services.duplication_scanner import CodeBlock, DuplicateScanner
 from services.metrics_tracker import MetricsTracker
+from tasks.analysis_scans import (
+    full_analysis_job,
+    scan_code_smells_job,
+    scan_duplications_job,
+)
 from utils.cache import cache
 
-router = APIRouter(prefix="/api/analysis", tags=["Advanced Analysis"])
+logger = logging.getLogger(__name__)
+
+# orjson encodes the large listings (and their UUIDs) natively
+router = APIRouter(
+    prefix="/api/analysis",
+    tags=["Advanced Analysis"],
+    default_response_class=ORJSONResponse,
+)
+
+
+def _read_disk_source(path: str) -> Optional[str]:
+    """
+    Decode a file straight out of a read-only mmap: the page cache backs
+    the buffer, so there is no intermediate bytes copy or text-mode
+    decoder per file.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return str(mm, "utf-8", "ignore")
+
+
+async def _read_source(file: File) -> Optional[str]:
+    """Source stored in the DB, falling back to disk (mostly for local dev)"""
+    if file.source:
+        return file.source
+    try:
+        return await asyncio.to_thread(_read_disk_source, file.file_path)
+    except Exception:
+        # Skip files we can't read
+        return None
+
+
+# Reads kept in flight at once; bounds open fds and pending tasks on repos
+# with thousands of files while still overlapping disk waits
+READ_BATCH_SIZE = 32
+
+
+async def _read_sources(files: List[File]) -> List[Optional[str]]:
+    """Read every file's source concurrently in batches, in input order"""
+    contents: List[Optional[str]] = []
+    for i in range(0, len(files), READ_BATCH_SIZE):
+        batch = files[i : i + READ_BATCH_SIZE]
+        contents.extend(await asyncio.gather(*(_read_source(f) for f in batch)))
+    return contents
+
+
+def _content_hashes(contents: List[Optional[str]]) -> List[Optional[str]]:
+    """blake2b-128 hex digest per readable source, None where unreadable"""
+    return [
+        (
+            hashlib.blake2b(content.encode(errors="ignore"), digest_size=16).hexdigest()
+            if content
+            else None
+        )
+        for content in contents
+    ]
+
+
+def _repository_files(db: Session, repository_id: uuid.UUID) -> list:
+    """
+    The columns the scan tasks need for every file of a repository, as
+    plain rows rather than ORM objects (blocking; run via asyncio.to_thread)
+    """
+    return db.execute(
+        select(
+            File.id,
+            File.file_path,
+            File.language,
+            File.source,
+            File.duplication_scan_hash,
+            File.smell_scan_hash,
+        ).where(File.repository_id == repository_id)
+    ).all()
+
+
+# Scanner processes, and scan batches queued at once (one per process)
+SCAN_WORKERS = os.cpu_count() or 1
+
+
+@lru_cache(maxsize=1)
+def _scan_executor() -> Executor:
+    """
+    Shared worker pool for the CPU-bound scanners, so a scan neither holds
+    the GIL against request handling nor blocks the event loop. The
+    analysis queue's worker runs with --pool=solo for this; a daemonic
+    process (a prefork child) may not start children of its own, so there
+    the scanners fall back to a single thread in-process.
+    """
+    if multiprocessing.current_process().daemon:
+        logger.warning(
+            "Daemonic worker process: analysis scans run on one thread; "
+            "consume the analysis queue with --pool=solo"
+        )
+        return ThreadPoolExecutor(max_workers=1)
+    return ProcessPoolExecutor(max_workers=SCAN_WORKERS)
+
+
+# Files whose sources are held in memory at once while a scan streams
+# through a repository
+SCAN_BATCH_SIZE = 100
+
+
+async def _iter_source_batches(files: list):
+    """Yield (files, contents) one batch at a time, in file order"""
+    for i in range(0, len(files), SCAN_BATCH_SIZE):
+        batch = files[i : i + SCAN_BATCH_SIZE]
+        yield batch, await _read_sources(batch)
+
+
+async def _source_hashes(files: list) -> List[Optional[str]]:
+    """Content hash per file, streamed so no source outlives its batch"""
+    hashes: List[Optional[str]] = []
+    async for _, contents in _iter_source_batches(files):
+        hashes.extend(await asyncio.to_thread(_content_hashes, contents))
+    return hashes
+
+
+async def _map_source_batches(
+    fn: Callable[[list], list],
+    files: list,
+    prepare: Callable[[list, List[Optional[str]]], list],
+) -> List[list]:
+    """
+    Stream `files` in batches, turn each into scanner input with
+    `prepare(batch, contents)` and run `fn` on it in the scan pool.
+    Per-batch results come back in order. At most one batch per scan
+    worker is queued, so resident sources stay bounded however large the
+    repository.
+    """
+    loop = asyncio.get_running_loop()
+    window = SCAN_WORKERS
+    pending: list = []
+    results: List[list] = []
+    async for batch, contents in _iter_source_batches(files):
+        items = prepare(batch, contents)
+        if not items:
+            continue
+        if len(pending) >= window:
+            results.append(await pending.pop(0))
+        pending.append(loop.run_in_executor(_scan_executor(), fn, items))
+    results.extend(await asyncio.gather(*pending))
+    return results
 
 
 # ----- Code Duplication Endpoints -----
 
 
 @router.post("/duplications/{repository_id}")
-async def scan_duplications(
-    repository_id: uuid.UUID,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-):
+async def scan_duplications(repository_id: uuid.UUID, db: Session = Depends(get_db)):
     """
     Scan repository for code duplications.
-    Runs asynchronously in background.
+    Runs on a Celery worker; poll /status/{task_id} for completion.
     """
     repo = db.query(Repository).filter_by(id=repository_id).first()
     if not repo:
         raise HTTPException(status_code=404, detail="Repository not found")
 
-    # Queue background task
-    background_tasks.add_task(scan_duplications_task, repository_id)
+    # Queue worker job
+    task = scan_duplications_job.delay(str(repository_id))
 
     return {
         "status": "started",
         "message": "Duplication scan started in background",
-        "repository_id": str(repository_id),
+        "repository_id": repository_id,
+        "task_id": task.id,
     }
 
 
-async def scan_duplications_task(repository_id: uuid.UUID):
-    """Background task to scan for duplications"""
+def _duplication_file_data(files: list, contents: List[Optional[str]]) -> List[dict]:
+    """Scanner input for the readable files of one batch"""
+    return [
+        {
+            "id": file.id,
+            "path": file.file_path,
+            "content": content,
+            "language": file.language or "python",
+        }
+        for file, content in zip(files, contents)
+        if content
+    ]
+
+
+def _duplication_representatives(files: list, hashes: List[Optional[str]]) -> dict:
+    """
+    Map each readable file to the first file with the same content hash and
+    language (itself for the first one). Unreadable files are left out.
+    """
+    first_by_key: dict = {}
+    representatives = {}
+    for file, h in zip(files, hashes):
+        if h is not None:
+            key = (h, file.language or "python")
+            representatives[file.id] = first_by_key.setdefault(key, file)
+    return representatives
+
+
+def _with_copy_blocks(
+    files: list, representatives: dict, block_chunks: List[List[CodeBlock]]
+) -> List[CodeBlock]:
+    """
+    All blocks in file order, where copies reuse their representative's
+    blocks re-labelled with their own id and path
+    """
+    blocks_by_file: Dict[uuid.UUID, List[CodeBlock]] = {}
+    for chunk in block_chunks:
+        for block in chunk:
+            blocks_by_file.setdefault(block.file_id, []).append(block)
+
+    blocks = []
+    for file in files:
+        representative = representatives.get(file.id)
+        if representative is None:
+            continue
+        own = blocks_by_file.get(representative.id, [])
+        if representative is file:
+            blocks.extend(own)
+        else:
+            blocks.extend(
+                replace(block, file_id=file.id, file_path=file.file_path)
+                for block in own
+            )
+    return blocks
+
+
+def _duplication_blocks(file_data: List[dict]) -> List[CodeBlock]:
+    """Tokenize and MinHash one chunk of files (in a worker process)"""
+    return DuplicateScanner().create_repository_blocks(file_data)
+
+
+def _match_duplications(blocks: List[CodeBlock]) -> List[dict]:
+    """Cross-file block matching over all chunks (in a worker process)"""
+    return DuplicateScanner().find_duplicate(blocks)
+
+
+def _replace_duplications(
+    db: Session,
+    repository_id: uuid.UUID,
+    duplications: List[dict],
+    scan_hashes: Dict[uuid.UUID, str],
+) -> None:
+    """
+    Swap the repository's stored duplications for a fresh scan, in one
+    transaction: readers never see an empty table, and a failed insert
+    rolls the delete back with it.
+    """
+    # Clear existing duplications for this repo
+    # Nothing of this table is loaded in the task session, so skip the
+    # identity-map synchronization pass
+    db.execute(
+        delete(CodeDuplication).where(CodeDuplication.repository_id == repository_id),
+        execution_options={"synchronize_session": False},
+    )
+
+    # Save to database
+    rows = [
+        {
+            "repository_id": repository_id,
+            "file1_id": dup["file1_id"],
+            "file1_start_line": dup["file1_start_line"],
+            "file1_end_line": dup["file1_end_line"],
+            "file2_id": dup["file2_id"],
+            "file2_start_line": dup["file2_start_line"],
+            "file2_end_line": dup["file2_end_line"],
+            "similarity_score": dup["similarity_score"],
+            "duplicated_lines": dup["duplicate_lines"],
+            "duplicated_tokens": dup["duplicate_tokens"],
+            "code_snippet": dup["code_snippet"],
+            "hash_signature": dup["hash_signature"],
+        }
+        for dup in duplications
+    ]
+    CodeDuplication.bulk_insert(db, rows, batch_size=1000)
+    db.execute(
+        update(File),
+        [
+            {"id": file_id, "duplication_scan_hash": h}
+            for file_id, h in scan_hashes.items()
+        ],
+    )
+    db.commit()
+
+
+async def scan_duplications_task(
+    repository_id: uuid.UUID,
+    files: Optional[list] = None,
+    hashes: Optional[List[Optional[str]]] = None,
+):
+    """
+    Background task to scan for duplications. `files` and their `hashes`
+    may be passed in when already computed (see full_analysis_task).
+    """
     db: Session = SessionLocal()
     try:
-        # Fetch all files with content
-        files = db.query(File).filter_by(repository_id=repository_id).all()
-
-        file_data = []
-        for file in files:
-            # Prefer source from DB, fallback to disk (mostly for local dev)
-            content = file.source
-            if not content:
-                try:
-                    with open(
-                        file.file_path, "r", encoding="utf-8", errors="ignore"
-                    ) as f:
-                        content = f.read()
-                except Exception as e:
-                    # Skip files we can't read
-                    continue
-
-            if content:
-                file_data.append(
-                    {
-                        "id": file.id,
-                        "path": file.file_path,
-                        "content": content,
-                        "language": file.language or "python",
-                    }
-                )
-
-        # Run duplication scanner
-        if file_data:
-            scanner = DuplicateScanner()
-            duplications = scanner.scan_repository(file_data)
-
-            # Clear existing duplications for this repo
-            db.execute(
-                delete(CodeDuplication).where(
-                    CodeDuplication.repository_id == repository_id
-                )
+        if files is None or hashes is None:
+            # Fetch all files with content
+            files = await asyncio.to_thread(_repository_files, db, repository_id)
+            hashes = await _source_hashes(files)
+
+        # Pairs span files, so any changed file means a full rescan; with
+        # none changed the stored duplications are still current
+        if all(
+            file.duplication_scan_hash == h
+            for file, h in zip(files, hashes)
+            if h is not None
+        ):
+            logger.info("Duplications for repo %s are up to date", repository_id)
+            return
+
+        # Byte-identical copies (vendored or copy-pasted files) are blocked
+        # once, through their first occurrence, and share its blocks
+        representatives = _duplication_representatives(files, hashes)
+        unique_files = [
+            file for file in files if representatives.get(file.id) is file
+        ]
+
+        # Blocking is per file and streams through the pool batch by batch;
+        # only the blocks are kept, since matching needs every one of them
+        block_chunks = await _map_source_batches(
+            _duplication_blocks, unique_files, _duplication_file_data
+        )
+        blocks = _with_copy_blocks(files, representatives, block_chunks)
+
+        # Run duplication scanner; with no blocks left (e.g. every file under
+        # min_tokens) the stored pairs are still cleared below
+        duplications: List[dict] = []
+        if blocks:
+            duplications = await asyncio.get_running_loop().run_in_executor(
+                _scan_executor(), _match_duplications, blocks
             )
-            db.commit()
-
-            # Save to database
-            for dup in duplications:
-                db_dup = CodeDuplication(
-                    repository_id=repository_id,
-                    file1_id=dup["file1_id"],
-                    file1_start_line=dup["file1_start_line"],
-                    file1_end_line=dup["file1_end_line"],
-                    file2_id=dup["file2_id"],
-                    file2_start_line=dup["file2_start_line"],
-                    file2_end_line=dup["file2_end_line"],
-                    similarity_score=dup["similarity_score"],
-                    duplicate_lines=dup["duplicate_lines"],
-                    duplicate_tokens=dup["duplicate_tokens"],
-                    code_snippet=dup["code_snippet"],
-                    hash_signature=dup["hash_signature"],
-                )
-                db.add(db_dup)
-
-            db.commit()
-    except Exception as e:
+        scan_hashes = {file.id: h for file, h in zip(files, hashes) if h is not None}
+        await asyncio.to_thread(
+            _replace_duplications, db, repository_id, duplications, scan_hashes
+        )
+    except Exception:
         db.rollback()
-        print(f"scan_duplications_task failed for repo {repository_id}: {e}")
+        logger.exception("scan_duplications_task failed for repo %s", repository_id)
+        raise
     finally:
         db.close()
 
@@ -129,6 +388,9 @@ async def get_duplications(
 
     duplications = (
         db.query(CodeDuplication)
+        .options(
+            joinedload(CodeDuplication.file1), joinedload(CodeDuplication.file2)
+        )
         .filter(
             CodeDuplication.repository_id == repository_id,
             CodeDuplication.similarity_score >= min_similarity,
@@ -139,152 +401,202 @@ async def get_duplications(
     )
 
     results = []
-    # Optimization: batch fetch files
-    file_ids = set()
     for dup in duplications:
-        file_ids.add(dup.file1_id)
-        file_ids.add(dup.file2_id)
-
-    files = db.query(File).filter(File.id.in_(file_ids)).all()
-    file_map = {f.id: f for f in files}
-
-    for dup in duplications:
-        file1 = file_map.get(dup.file1_id)
-        file2 = file_map.get(dup.file2_id)
+        file1 = dup.file1
+        file2 = dup.file2
 
         results.append(
             {
-                "id": str(dup.id),
+                "id": dup.id,
                 "file1": {
-                    "id": str(dup.file1_id),
+                    "id": dup.file1_id,
                     "path": file1.file_path if file1 else "Unknown",
                     "start_line": dup.file1_start_line,
                     "end_line": dup.file1_end_line,
                 },
                 "file2": {
-                    "id": str(dup.file2_id),
+                    "id": dup.file2_id,
                     "path": file2.file_path if file2 else "Unknown",
                     "start_line": dup.file2_start_line,
                     "end_line": dup.file2_end_line,
                 },
                 "similarity": round((dup.similarity_score or 0) * 100, 1),
-                "duplicate_lines": dup.duplicate_lines,
-                "duplicate_tokens": dup.duplicate_tokens,
+                "duplicate_lines": dup.duplicated_lines,
+                "duplicate_tokens": dup.duplicated_tokens,
                 "code_snippet": (dup.code_snippet or "")[:200],
             }
         )
 
     return {
-        "repository_id": str(repository_id),
+        "repository_id": repository_id,
         "total_duplications": len(results),
         "duplications": results,
     }
 
 
 @router.post("/code-smells/{repository_id}")
-async def scan_code_smells(
-    repository_id: uuid.UUID,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-):
-    """Scan repository for code smells"""
+async def scan_code_smells(repository_id: uuid.UUID, db: Session = Depends(get_db)):
+    """Scan repository for code smells (on a Celery worker)"""
 
     repo = db.query(Repository).filter_by(id=repository_id).first()
     if not repo:
         raise HTTPException(status_code=404, detail="Repository not found")
 
-    background_tasks.add_task(scan_code_smells_task, repository_id)
+    task = scan_code_smells_job.delay(str(repository_id))
 
     return {
         "status": "started",
         "message": "Code smell scan started in background",
-        "repository_id": str(repository_id),
+        "repository_id": repository_id,
+        "task_id": task.id,
     }
 
 
-async def scan_code_smells_task(repository_id: uuid.UUID):
-    """Background task to scan for code smells"""
+def _symbols_by_file(db: Session, file_ids: list) -> Dict[uuid.UUID, List[dict]]:
+    """Smell-detector symbol dicts for `file_ids`, grouped by file"""
+    # One column-projected IN query for every file's symbols, grouped here.
+    # The scan tasks hold Row tuples rather than File objects, so there is
+    # no File.symbols for selectinload to fill, and only these columns are
+    # needed
+    symbols_by_file: Dict[uuid.UUID, List[dict]] = {}
+    rows = db.execute(
+        select(
+            Symbol.file_id,
+            Symbol.id,
+            Symbol.name,
+            Symbol.type,
+            Symbol.line_start,
+            Symbol.line_end,
+        ).where(Symbol.file_id.in_(file_ids))
+    )
+    for file_id, symbol_id, name, symbol_type, line_start, line_end in rows:
+        symbols_by_file.setdefault(file_id, []).append(
+            {
+                "id": symbol_id,
+                "name": name,
+                "type": (
+                    symbol_type.value
+                    if hasattr(symbol_type, "value")
+                    else str(symbol_type)
+                ),
+                "start_line": line_start,
+                "end_line": line_end,
+            }
+        )
+    return symbols_by_file
+
+
+def _find_code_smells(file_data: List[dict]) -> List[SmellFinding]:
+    """Run the code smell detector on a chunk of files (in a worker process)"""
+    return CodeSmellDetector().scan_repository(file_data)
+
+
+def _replace_code_smells(
+    db: Session,
+    repository_id: uuid.UUID,
+    smells: List[SmellFinding],
+    scan_hashes: Dict[uuid.UUID, str],
+) -> None:
+    """
+    Swap the stored code smells of the rescanned files for fresh ones, in
+    one transaction like _replace_duplications.
+    """
+    # Clear existing smells of the rescanned files; unchanged files keep theirs
+    db.execute(
+        delete(CodeSmell).where(
+            CodeSmell.repository_id == repository_id,
+            CodeSmell.file_id.in_(list(scan_hashes)),
+        ),
+        execution_options={"synchronize_session": False},
+    )
+
+    # Save to database
+    rows = [
+        {
+            "repository_id": repository_id,
+            "file_id": smell.file_id,
+            "symbol_id": smell.symbol_id,
+            "smell_type": smell.smell_type,
+            "severity": smell.severity,
+            "title": smell.title,
+            "description": smell.description,
+            "suggestion": smell.suggestion,
+            "start_line": smell.start_line,
+            "end_line": smell.end_line,
+            "metric_value": smell.metric_value,
+            "metric_threshold": smell.metric_threshold,
+        }
+        for smell in smells
+    ]
+    CodeSmell.bulk_insert(db, rows, batch_size=1000)
+    db.execute(
+        update(File),
+        [
+            {"id": file_id, "smell_scan_hash": h}
+            for file_id, h in scan_hashes.items()
+        ],
+    )
+    db.commit()
+
+
+async def scan_code_smells_task(
+    repository_id: uuid.UUID,
+    files: Optional[list] = None,
+    hashes: Optional[List[Optional[str]]] = None,
+):
+    """Background task to scan for code smells (same arguments as above)"""
     db: Session = SessionLocal()
     try:
-        files = db.query(File).filter_by(repository_id=repository_id).all()
-
-        file_data = []
-        for file in files:
-            content = file.source
-            if not content:
-                try:
-                    with open(
-                        file.file_path, "r", encoding="utf-8", errors="ignore"
-                    ) as f:
-                        content = f.read()
-                except Exception:
-                    continue
-
-            if not content:
-                continue
-
-            try:
-                # Get symbols for this file
-                symbols = db.query(Symbol).filter_by(file_id=file.id).all()
-                symbol_data = [
-                    {
-                        "id": s.id,
-                        "name": s.name,
-                        "type": (
-                            s.type.value if hasattr(s.type, "value") else str(s.type)
-                        ),
-                        "start_line": s.line_start,
-                        "end_line": s.line_end,
-                        # removed parent_id as it doesn't exist on Symbol model
-                    }
-                    for s in symbols
-                ]
+        if files is None or hashes is None:
+            files = await asyncio.to_thread(_repository_files, db, repository_id)
+            hashes = await _source_hashes(files)
+
+        # Smells are per file, so only files changed since their last scan
+        # are re-detected
+        hash_by_id = {
+            file.id: h
+            for file, h in zip(files, hashes)
+            if h is not None and file.smell_scan_hash != h
+        }
+        if not hash_by_id:
+            logger.info("Code smells for repo %s are up to date", repository_id)
+            return
+        changed_files = [file for file in files if file.id in hash_by_id]
+        symbols_by_file = await asyncio.to_thread(
+            _symbols_by_file, db, list(hash_by_id)
+        )
 
-                file_data.append(
-                    {
-                        "id": file.id,
-                        "path": file.file_path,
-                        "content": content,
-                        "symbols": symbol_data,
-                    }
-                )
-            except Exception as e:
-                print(f"Error preparing file data for {file.file_path}: {e}")
-                continue
-
-        if file_data:
-            # Run code smell detector
-            detector = CodeSmellDetector()
-            smells = detector.scan_repository(file_data)
-
-            # Clear existing smells
-            db.execute(
-                delete(CodeSmell).where(CodeSmell.repository_id == repository_id)
+        # Only files that reached the detector count as scanned
+        scanned_ids: List[uuid.UUID] = []
+
+        def smell_file_data(batch: list, contents: List[Optional[str]]) -> List[dict]:
+            file_data = [
+                {
+                    "id": file.id,
+                    "path": file.file_path,
+                    "content": content,
+                    "symbols": symbols_by_file.get(file.id, []),
+                }
+                for file, content in zip(batch, contents)
+                if content
+            ]
+            scanned_ids.extend(data["id"] for data in file_data)
+            return file_data
+
+        # Run code smell detector
+        smell_chunks = await _map_source_batches(
+            _find_code_smells, changed_files, smell_file_data
+        )
+        if scanned_ids:
+            smells = [smell for chunk in smell_chunks for smell in chunk]
+            scan_hashes = {file_id: hash_by_id[file_id] for file_id in scanned_ids}
+            await asyncio.to_thread(
+                _replace_code_smells, db, repository_id, smells, scan_hashes
             )
-            db.commit()
-
-            # Save to database
-            for smell in smells:
-                db_smell = CodeSmell(
-                    repository_id=repository_id,
-                    file_id=smell.file_id,
-                    symbol_id=smell.symbol_id,
-                    smell_type=smell.smell_type,
-                    severity=smell.severity,
-                    title=smell.title,
-                    description=smell.description,
-                    suggestion=smell.suggestion,
-                    start_line=smell.start_line,
-                    end_line=smell.end_line,
-                    metric_value=smell.metric_value,
-                    metric_threshold=smell.metric_threshold,
-                )
-                db.add(db_smell)
-
-            db.commit()
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"scan_code_smells_task failed for repo {repository_id}: {e}")
+        logger.exception("scan_code_smells_task failed for repo %s", repository_id)
+        raise
     finally:
         db.close()
 
@@ -319,29 +631,30 @@ async def get_code_smells(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid smell_type")
 
+    # Stream rows in batches instead of materializing the whole result
     smells = (
         query.order_by(CodeSmell.severity.desc(), CodeSmell.created_at.desc())
         .limit(limit)
-        .all()
+        .yield_per(200)
     )
 
     results = []
     for smell in smells:
         results.append(
             {
-                "id": str(smell.id),
+                "id": smell.id,
                 "smell_type": smell.smell_type.value,
                 "severity": smell.severity.value,
                 "title": smell.title,
                 "description": smell.description,
                 "suggestion": smell.suggestion,
                 "file": {
-                    "id": str(smell.file_id),
+                    "id": smell.file_id,
                     "path": smell.file.file_path if smell.file else "Unknown",
                 },
                 "symbol": (
                     {
-                        "id": str(smell.symbol_id),
+                        "id": smell.symbol_id,
                         "name": smell.symbol.name if smell.symbol else None,
                     }
                     if smell.symbol_id
@@ -359,7 +672,7 @@ async def get_code_smells(
         )
 
     return {
-        "repository_id": str(repository_id),
+        "repository_id": repository_id,
         "total_smells": len(results),
         "code_smells": results,
     }
@@ -371,30 +684,34 @@ async def get_undocumented_symbols(
     repository_id: uuid.UUID, limit: int = 100, db: Session = Depends(get_db)
 ):
     """List symbols that are missing documentation (Sprint 9)"""
-    symbols = (
-        db.query(Symbol)
-        .join(File)
-        .filter(
+    # File path comes from the join itself, not a lazy load per symbol
+    symbols = db.execute(
+        select(Symbol.id, Symbol.name, Symbol.type, File.file_path, Symbol.line_start)
+        .join(File, File.id == Symbol.file_id)
+        .where(
             File.repository_id == repository_id,
             Symbol.has_docstring == False,
             Symbol.type.in_([SymbolType.function, SymbolType.class_]),
         )
         .limit(limit)
-        .all()
-    )
+    ).all()
 
     return {
-        "repository_id": str(repository_id),
+        "repository_id": repository_id,
         "count": len(symbols),
         "undocumented_symbols": [
             {
-                "id": str(s.id),
-                "name": s.name,
-                "type": (s.type.value if hasattr(s.type, "value") else str(s.type)),
-                "file": s.file.file_path,
-                "line": s.line_start,
+                "id": symbol_id,
+                "name": name,
+                "type": (
+                    symbol_type.value
+                    if hasattr(symbol_type, "value")
+                    else str(symbol_type)
+                ),
+                "file": file_path,
+                "line": line_start,
             }
-            for s in symbols
+            for symbol_id, name, symbol_type, file_path, line_start in symbols
         ],
     }
 
@@ -412,6 +729,7 @@ async def generate_documentation(
     files = (
         db.query(File)
         .join(Symbol)
+        .options(selectinload(File.symbols))
         .filter(
             File.repository_id == repository_id,
             Symbol.has_docstring == False,
@@ -422,20 +740,11 @@ async def generate_documentation(
     )
 
     file_data = []
-    for file in files:
-        content = file.source
-        if not content:
-            try:
-                with open(file.file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-            except Exception:
-                continue
-
+    for file, content in zip(files, await _read_sources(files)):
         if not content:
             continue
 
         try:
-            symbols = db.query(Symbol).filter_by(file_id=file.id).all()
             symbol_data = [
                 {
                     "id": s.id,
@@ -444,7 +753,7 @@ async def generate_documentation(
                     "start_line": s.line_start,
                     "end_line": s.line_end,
                 }
-                for s in symbols
+                for s in file.symbols
                 if hasattr(s.type, "value")
                 and s.type.value in ["function", "method", "class"]
             ]
@@ -463,7 +772,7 @@ async def generate_documentation(
 
     if not file_data:
         return {
-            "repository_id": str(repository_id),
+            "repository_id": repository_id,
             "files_processed": 0,
             "functions_documented": 0,
             "documentation": [],
@@ -486,7 +795,7 @@ async def generate_documentation(
         db.commit()
 
     return {
-        "repository_id": str(repository_id),
+        "repository_id": repository_id,
         "files_processed": len(file_data),
         "functions_documented": len(documentation),
         "symbols_marked_as_documented": len(documented_symbol_ids),
@@ -508,8 +817,8 @@ async def create_metrics_snapshot(
     snapshot = await tracker.create_snapshot(repository_id)
 
     return {
-        "id": str(snapshot.id),
-        "repository_id": str(repository_id),
+        "id": snapshot.id,
+        "repository_id": repository_id,
         "quality_score": round(snapshot.quality_score or 0, 1),
         "metrics": {
             "files": snapshot.total_files,
@@ -535,10 +844,10 @@ async def get_metrics_history(
     history = tracker.get_history(repository_id, limit=limit)
 
     return {
-        "repository_id": str(repository_id),
+        "repository_id": repository_id,
         "snapshots": [
             {
-                "id": str(s.id),
+                "id": s.id,
                 "quality_score": round(s.quality_score or 0, 1),
                 "total_files": s.total_files,
                 "total_lines": s.total_lines,
@@ -554,11 +863,7 @@ async def get_metrics_history(
 
 
 @router.post("/full-scan/{repository_id}")
-async def run_full_analysis(
-    repository_id: uuid.UUID,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-):
+async def run_full_analysis(repository_id: uuid.UUID, db: Session = Depends(get_db)):
     """
     Run complete analysis suite:
     - Code duplication detection
@@ -570,25 +875,64 @@ async def run_full_analysis(
     if not repo:
         raise HTTPException(status_code=404, detail="Repository not found")
 
-    background_tasks.add_task(scan_duplications_task, repository_id)
-    background_tasks.add_task(scan_code_smells_task, repository_id)
-    background_tasks.add_task(create_snapshot_task, repository_id)
+    task = full_analysis_job.delay(str(repository_id))
 
     return {
         "status": "started",
         "message": "Full analysis started in background",
-        "repository_id": str(repository_id),
+        "repository_id": repository_id,
         "tasks": ["duplications", "code_smells", "metrics_snapshot"],
+        "task_id": task.id,
     }
 
 
+async def full_analysis_task(repository_id: uuid.UUID):
+    """
+    Both scans over one listing and hashing pass of the repository, run
+    concurrently, then the metrics snapshot, which counts their results
+    """
+    db: Session = SessionLocal()
+    try:
+        files = await asyncio.to_thread(_repository_files, db, repository_id)
+    finally:
+        db.close()
+    hashes = await _source_hashes(files)
+
+    # Each scan commits through its own session; neither reads the other's
+    # output, so one's file reads overlap the other's detection work
+    # A failed scan must not cancel the other mid-write, so both run to the
+    # end and the first failure is raised after the snapshot
+    results = await asyncio.gather(
+        scan_duplications_task(repository_id, files, hashes),
+        scan_code_smells_task(repository_id, files, hashes),
+        return_exceptions=True,
+    )
+    await create_snapshot_task(repository_id)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
 async def create_snapshot_task(repository_id: uuid.UUID):
     """Background task to create metrics snapshot"""
     db: Session = SessionLocal()
     try:
         tracker = MetricsTracker(db)
         await tracker.create_snapshot(repository_id)
-    except Exception as e:
-        print(f"create_snapshot_task failed: {e}")
+    except Exception:
+        logger.exception("create_snapshot_task failed for repo %s", repository_id)
+        raise
     finally:
         db.close()
+
+
+@router.get("/status/{task_id}")
+async def get_scan_status(task_id: str):
+    """State of a queued analysis job (PENDING, STARTED, SUCCESS, FAILURE)"""
+    result = celery_app.AsyncResult(task_id)
+    return {
+        "task_id": task_id,
+        "status": result.state,
+        "result": result.result if result.successful() else None,
+        "error": str(result.result) if result.failed() else None,
+    }
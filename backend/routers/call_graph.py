@@ -3,56 +3,136 @@ Call graph API endpoints.
 """
 
 import re
-from collections import defaultdict
+from collections import defaultdict, deque
 from sys import prefix
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import Session, aliased, load_only
 
 from database import get_db
 from models.call_relationship import CallRelationship
 from models.file import File
 from models.repository import Repository
-from utils.cache import cache
-
-router = APIRouter(prefix="/api/call-graph", tags=["call-graph"])
-
-
-def detect_cycles_dfs(graph: Dict[str, List[str]]) -> List[List[str]]:
+from services.call_graph_payload import (
+    build_call_graph,
+    call_graph_version,
+    decode_cursor,
+    empty_call_graph,
+    load_call_graph_payload,
+)
+from utils.cache import cache, get_cached, set_cached
+
+router = APIRouter(
+    prefix="/api/call-graph",
+    tags=["call-graph"],
+    default_response_class=ORJSONResponse,
+)
+
+# Versioned keys never go stale, so the TTL only bounds Redis memory
+CALL_GRAPH_CACHE_TTL = 3600
+
+
+def strongly_connected_components(graph: Dict[str, List[str]]) -> List[List[str]]:
     """
-    Detect all cycles in a directed graph using DFS.
-    Returns list of cycles (each cycle is a list of node names).
+    Tarjan's strongly connected components, O(nodes + edges). Iterative,
+    over an explicit (node, neighbor iterator) stack, so deep call chains
+    cannot hit the interpreter's recursion limit. Components come out in
+    reverse topological order.
     """
-    cycles = []
-    visited = set()
-    rec_stack = set()
-    path = []
-
-    def dfs(node: str):
-        visited.add(node)
-        rec_stack.add(node)
-        path.append(node)
-
-        for neighbor in graph.get(node, []):
-            if neighbor not in visited:
-                dfs(neighbor)
-            elif neighbor in rec_stack:
-                cycle_start_idx = path.index(neighbor)
-                cycle = path[cycle_start_idx:] + [neighbor]
-                normalized_cycle = tuple(sorted(cycle))
-                if normalized_cycle not in [tuple(sorted(c)) for c in cycles]:
-                    cycles.append(cycle)
-
-        path.pop()
-        rec_stack.remove(node)
-
-    for node in graph:
-        if node not in visited:
-            dfs(node)
-
-    return cycles
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack = set()
+    scc_stack: List[str] = []
+    components: List[List[str]] = []
+
+    def visit(node: str):
+        index[node] = lowlink[node] = len(index)
+        scc_stack.append(node)
+        on_stack.add(node)
+        work.append((node, iter(graph.get(node, ()))))
+
+    work = []
+    for root in graph:
+        if root in index:
+            continue
+        visit(root)
+        while work:
+            node, neighbors = work[-1]
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    visit(neighbor)
+                    break
+                if neighbor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[neighbor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack.remove(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def is_cyclic_component(graph: Dict[str, List[str]], component: List[str]) -> bool:
+    """A component is a circular dependency if it has 2+ nodes or a self-call."""
+    return len(component) > 1 or component[0] in graph.get(component[0], ())
+
+
+def representative_cycle(
+    graph: Dict[str, List[str]], component: List[str]
+) -> List[str]:
+    """
+    Shortest cycle through the component's first node (by name), found by a
+    BFS restricted to the component. The start node is repeated at the
+    end, e.g. ["a", "b", "a"].
+    """
+    members = set(component)
+    start = min(component)
+    parent: Dict[str, Optional[str]] = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for neighbor in graph.get(node, ()):
+            if neighbor == start:
+                cycle = [start]
+                while node is not None:
+                    cycle.append(node)
+                    node = parent[node]
+                cycle.reverse()
+                return cycle
+            if neighbor in members and neighbor not in parent:
+                parent[neighbor] = node
+                queue.append(neighbor)
+    return []
+
+
+def _internal_call_graph(db: Session, repository_id: str) -> Dict[str, List[str]]:
+    """Adjacency lists of internal calls, loading only the two name columns."""
+    rows = db.execute(
+        select(CallRelationship.caller_name, CallRelationship.callee_name).where(
+            CallRelationship.repository_id == repository_id,
+            CallRelationship.is_external == False,
+            CallRelationship.caller_name.is_not(None),
+            CallRelationship.callee_name.is_not(None),
+        )
+    )
+    graph = defaultdict(list)
+    for caller_name, callee_name in rows:
+        graph[caller_name].append(callee_name)
+    return dict(graph)
 
 
 def extract_imports_from_file(file_path: str, content: str, language: str) -> List[str]:
@@ -93,85 +173,58 @@ def extract_imports_from_file(file_path: str, content: str, language: str) -> Li
     return list(set(imports))
 
 
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/repositories/{repository_id}/call-graph")
-@cache(expire=600, prefix="call_graph")
-def get_call_graph(repository_id: str, db: Session = Depends(get_db)):
+def get_call_graph(
+    repository_id: str,
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=10_000),
+    db: Session = Depends(get_db),
+):
     """
     Get call graph for repository.
     Shows function call relationships (who calls whom).
     Reads from pre-computed call_relationships table.
+
+    Without `limit` the whole graph is returned. With it, the graph of one
+    page of relationships in (caller_name, id) order comes back together
+    with `next_cursor`, to be passed as `after` for the following page.
     """
+    cursor = _decode_cursor(after) if after is not None else None
+
     repo = db.query(Repository).filter(Repository.id == repository_id).first()
     if not repo:
         raise HTTPException(status_code=404, detail="Repository not found")
 
-    relationships = (
-        db.query(CallRelationship)
-        .filter(CallRelationship.repository_id == repository_id)
-        .all()
-    )
-
-    if not relationships:
-        return {
-            "repository_id": repository_id,
-            "total_functions": 0,
-            "total_calls": 0,
-            "nodes": [],
-            "edges": [],
-            "message": "No function calls detected. Make sure your repository contains analyzable code (Python, C, Assembly, or COBOL).",
-        }
-
-    nodes_map = {}
-
-    for rel in relationships:
-        if rel.caller_name is not None and rel.caller_name not in nodes_map:
-            nodes_map[rel.caller_name] = {
-                "id": rel.caller_name,
-                "name": rel.caller_name,
-                "file": rel.caller_file,
-                "line": None,
-                "calls": [],
-                "called_by": [],
-            }
-        if rel.callee_name is not None and rel.callee_name not in nodes_map:
-            nodes_map[rel.callee_name] = {
-                "id": rel.callee_name,
-                "name": rel.callee_name,
-                "file": rel.callee_file or "external",
-                "line": None,
-                "is_external": rel.is_external,
-                "calls": [],
-                "called_by": [],
-            }
-
-    for rel in relationships:
-        if rel.caller_name is not None and rel.callee_name is not None:
-            if rel.caller_name in nodes_map:
-                nodes_map[rel.caller_name]["calls"].append(rel.callee_name)
-            if rel.callee_name in nodes_map:
-                nodes_map[rel.callee_name]["called_by"].append(rel.caller_name)
-
-    nodes = list(nodes_map.values())
-
-    edges = [
-        {
-            "from": rel.caller_name,
-            "to": rel.callee_name,
-            "file": rel.caller_file,
-            "line": rel.call_line,
-            "is_external": rel.is_external,
-        }
-        for rel in relationships
-        if rel.caller_name is not None and rel.callee_name is not None
-    ]
-
-    return {
-        "repository_id": repository_id,
-        "total_functions": len(nodes),
-        "total_calls": len(edges),
-        "nodes": nodes,
-        "edges": edges,
-    }
+    version = call_graph_version(db, repository_id)
+    if version is None:
+        # Nothing extracted yet: no relationship scan, no cache round trip
+        graph = empty_call_graph(repository_id)
+        if limit is not None:
+            graph["next_cursor"] = None
+        return graph
+
+    if limit is None:
+        # The full graph is materialized by the extraction task. When it is
+        # missing or older than the relationships it is built below for the
+        # response only; a read never writes the stored payload.
+        body = load_call_graph_payload(db, repository_id, version)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+
+    key = f"call_graph:graph:{repository_id}:{version}:{after}:{limit}"
+    body = get_cached(key)
+    if body is None:
+        graph = build_call_graph(db, repository_id, cursor, limit)
+        body = orjson.dumps(graph).decode()
+        set_cached(key, body, expire=CALL_GRAPH_CACHE_TTL)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/repositories/{repository_id}/stats")
@@ -184,54 +237,41 @@ def get_call_graph_stats(repository_id: str, db: Session = Depends(get_db)):
     if not repo:
         raise HTTPException(status_code=404, detail="Repository not found")
 
-    unique_functions = (
-        db.query(func.count(func.distinct(CallRelationship.caller_name)))
-        .filter(CallRelationship.repository_id == repository_id)
-        .scalar()
-    )
-
-    total_calls = (
-        db.query(func.count(CallRelationship.id))
+    unique_functions, total_calls = (
+        db.query(
+            func.count(func.distinct(CallRelationship.caller_name)),
+            func.count(CallRelationship.id),
+        )
         .filter(CallRelationship.repository_id == repository_id)
-        .scalar()
+        .one()
     )
 
-    all_functions = (
-        db.query(func.distinct(CallRelationship.caller_name))
-        .filter(CallRelationship.repository_id == repository_id)
-        .all()
-    )
-    called_functions = (
-        db.query(func.distinct(CallRelationship.callee_name))
-        .filter(
-            CallRelationship.repository_id == repository_id,
-            CallRelationship.is_external == False,
+    # Callers that are never called internally; the set difference runs in
+    # Postgres so only the count comes back
+    dead_names = (
+        select(CallRelationship.caller_name)
+        .where(CallRelationship.repository_id == repository_id)
+        .except_(
+            select(CallRelationship.callee_name).where(
+                CallRelationship.repository_id == repository_id,
+                CallRelationship.is_external == False,
+            )
         )
-        .all()
+        .subquery()
     )
-
-    all_func_set = {f[0] for f in all_functions if f[0] is not None}
-    called_func_set = {f[0] for f in called_functions if f[0] is not None}
-    dead_functions_count = len(all_func_set - called_func_set)
-
-    # Detect circular dependencies
-    relationships = (
-        db.query(CallRelationship)
-        .filter(
-            CallRelationship.repository_id == repository_id,
-            CallRelationship.is_external == False,
-        )
-        .all()
+    dead_functions_count = db.execute(
+        select(func.count()).select_from(dead_names)
+    ).scalar_one()
+
+    # Circular dependencies: count strongly connected components rather
+    # than enumerating every elementary cycle, which can be exponential
+    graph = _internal_call_graph(db, repository_id)
+    circular_deps_count = sum(
+        1
+        for component in strongly_connected_components(graph)
+        if is_cyclic_component(graph, component)
     )
 
-    graph = defaultdict(list)
-    for rel in relationships:
-        if rel.caller_name is not None and rel.callee_name is not None:
-            graph[rel.caller_name].append(rel.callee_name)
-
-    cycles = detect_cycles_dfs(dict(graph))
-    circular_deps_count = len(cycles)
-
     return {
         "repository_id": repository_id,
         "total_functions": unique_functions or 0,
@@ -252,7 +292,13 @@ def get_dependencies(repository_id: str, db: Session = Depends(get_db)):
     if not repo:
         raise HTTPException(status_code=404, detail="Repository not found")
 
-    files = db.query(File).filter(File.repository_id == repository_id).all()
+    # Source comes from the DB column populated at ingestion; skip the rest
+    files = (
+        db.query(File)
+        .options(load_only(File.file_path, File.language, File.source))
+        .filter(File.repository_id == repository_id)
+        .all()
+    )
 
     if not files:
         return {
@@ -306,29 +352,27 @@ def get_dead_code(repository_id: str, db: Session = Depends(get_db)):
     if not repo:
         raise HTTPException(status_code=404, detail="Repository not found")
 
+    called = aliased(CallRelationship)
     caller_stats = (
         db.query(
             CallRelationship.caller_name,
             CallRelationship.caller_file,
             func.count(CallRelationship.id).label("call_count"),
         )
-        .filter(CallRelationship.repository_id == repository_id)
-        .group_by(CallRelationship.caller_name, CallRelationship.caller_file)
-        .all()
-    )
-
-    called_functions_names = (
-        db.query(CallRelationship.callee_name)
         .filter(
             CallRelationship.repository_id == repository_id,
-            CallRelationship.is_external == False,
+            CallRelationship.caller_name.is_not(None),
+            # Anti-join against internal callees instead of a Python set-diff
+            ~exists().where(
+                called.repository_id == repository_id,
+                called.is_external == False,
+                called.callee_name == CallRelationship.caller_name,
+            ),
         )
-        .distinct()
+        .group_by(CallRelationship.caller_name, CallRelationship.caller_file)
         .all()
     )
 
-    called_names = {name[0] for name in called_functions_names if name[0] is not None}
-
     dead_functions = [
         {
             "name": stat.caller_name,
@@ -337,7 +381,6 @@ def get_dead_code(repository_id: str, db: Session = Depends(get_db)):
             "calls": stat.call_count,
         }
         for stat in caller_stats
-        if stat.caller_name is not None and stat.caller_name not in called_names
     ]
 
     return {
@@ -351,34 +394,27 @@ def get_dead_code(repository_id: str, db: Session = Depends(get_db)):
 @cache(expire=600, prefix="call_graph")
 def get_circular_dependencies(repository_id: str, db: Session = Depends(get_db)):
     """
-    Find circular dependencies in call graph using DFS cycle detection.
+    Find circular dependencies in call graph: one representative (shortest)
+    cycle per strongly connected component.
     """
     repo = db.query(Repository).filter(Repository.id == repository_id).first()
     if not repo:
         raise HTTPException(status_code=404, detail="Repository not found")
 
-    relationships = (
-        db.query(CallRelationship)
-        .filter(
-            CallRelationship.repository_id == repository_id,
-            CallRelationship.is_external == False,
-        )
-        .all()
-    )
+    graph = _internal_call_graph(db, repository_id)
 
-    if not relationships:
+    if not graph:
         return {
             "repository_id": repository_id,
             "circular_dependencies": [],
             "total_cycles": 0,
         }
 
-    graph = defaultdict(list)
-    for rel in relationships:
-        if rel.caller_name is not None and rel.callee_name is not None:
-            graph[rel.caller_name].append(rel.callee_name)
-
-    cycles = detect_cycles_dfs(dict(graph))
+    cycles = [
+        representative_cycle(graph, component)
+        for component in strongly_connected_components(graph)
+        if is_cyclic_component(graph, component)
+    ]
 
     circular_deps = []
     for cycle in cycles:
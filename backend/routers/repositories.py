@@ -7,7 +7,7 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from database import get_db
-from models import File, Repository, Symbol
+from models import File, Repository, Symbol, SymbolType
 
 router = APIRouter(prefix="/api/repositories", tags=["repositories"])
 
@@ -223,7 +223,13 @@ def get_repository_symbols(
     if language:
         query = query.filter(File.language == language)
     if type:
-        query = query.filter(Symbol.type == type)
+        # Symbols are stored by value ("class"); the member name ("class_")
+        # is still accepted from older clients
+        try:
+            symbol_type = SymbolType.__members__.get(type) or SymbolType(type)
+            query = query.filter(Symbol.type == symbol_type)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid type")
     results = query.limit(limit).all()
     return {
         "repository_id": repository_id,
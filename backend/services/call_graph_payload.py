@@ -0,0 +1,180 @@
+"""
+Call graph payloads: the node/edge JSON served by the call graph endpoint.
+
+The full graph of a repository is built once per extraction run and kept,
+already serialized, in call_graph_payloads, so serving it is one indexed
+row lookup. Keyset pages are built on request.
+"""
+
+import base64
+from typing import Optional, Tuple
+
+import orjson
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models.call_graph_payload import CallGraphPayload
+from models.call_relationship import CallRelationship
+
+
+def encode_cursor(caller_name: str, rel_id: int) -> str:
+    """Opaque keyset cursor for the call-graph row after (caller_name, id)"""
+    return base64.urlsafe_b64encode(orjson.dumps([caller_name, rel_id])).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        caller_name, rel_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        return str(caller_name), int(rel_id)
+    except TypeError as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def call_graph_version(db: Session, repository_id) -> Optional[str]:
+    """
+    Identity of a repository's current call relationships, None when it has
+    none. Extraction only ever appends rows, so the newest id and the row
+    count change with every run.
+    """
+    max_id, total = (
+        db.query(func.max(CallRelationship.id), func.count(CallRelationship.id))
+        .filter(CallRelationship.repository_id == repository_id)
+        .one()
+    )
+    return f"{max_id}:{total}" if total else None
+
+
+def load_call_graph_payload(db: Session, repository_id, version: str) -> Optional[str]:
+    """Stored full-graph JSON, if it was built from `version`"""
+    return db.execute(
+        select(CallGraphPayload.payload).where(
+            CallGraphPayload.repository_id == repository_id,
+            CallGraphPayload.version == version,
+        )
+    ).scalar_one_or_none()
+
+
+def store_call_graph_payload(db: Session, repository_id, version: str) -> str:
+    """Build the full graph, upsert its JSON for `version` and return it"""
+    payload = orjson.dumps(build_call_graph(db, str(repository_id))).decode()
+    stmt = insert(CallGraphPayload).values(
+        repository_id=repository_id, version=version, payload=payload
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CallGraphPayload.repository_id],
+            set_={
+                "version": stmt.excluded.version,
+                "payload": stmt.excluded.payload,
+                "computed_at": func.now(),
+            },
+        )
+    )
+    db.commit()
+    return payload
+
+
+def empty_call_graph(repository_id: str) -> dict:
+    return {
+        "repository_id": repository_id,
+        "total_functions": 0,
+        "total_calls": 0,
+        "nodes": [],
+        "edges": [],
+        "message": "No function calls detected. Make sure your repository contains analyzable code (Python, C, Assembly, or COBOL).",
+    }
+
+
+def build_call_graph(
+    db: Session,
+    repository_id: str,
+    after: Optional[Tuple[str, int]] = None,
+    limit: Optional[int] = None,
+) -> dict:
+    """
+    Nodes and edges of a repository's call graph, or of one keyset page of
+    its relationships when `limit` is given
+    """
+    # Only the columns the graph uses, streamed as plain rows
+    stmt = select(
+        CallRelationship.caller_name,
+        CallRelationship.callee_name,
+        CallRelationship.caller_file,
+        CallRelationship.callee_file,
+        CallRelationship.call_line,
+        CallRelationship.is_external,
+        CallRelationship.id,
+    ).where(CallRelationship.repository_id == repository_id)
+    if limit is not None:
+        # Keyset page: a range scan from the cursor, not an OFFSET skip
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(CallRelationship.caller_name, CallRelationship.id) > after
+            )
+        stmt = stmt.order_by(CallRelationship.caller_name, CallRelationship.id)
+        stmt = stmt.limit(limit)
+    relationships = db.execute(stmt.execution_options(yield_per=10_000))
+
+    # Nodes, adjacency and edges are all built in one sweep over the rows
+    nodes_map = {}
+    edges = []
+    add_edge = edges.append
+    rows = 0
+    last = None
+
+    for row in relationships:
+        caller, callee, caller_file, callee_file, line, is_external, rel_id = row
+        rows += 1
+        last = (caller, rel_id)
+        if caller is not None and caller not in nodes_map:
+            nodes_map[caller] = {
+                "id": caller,
+                "name": caller,
+                "file": caller_file,
+                "line": None,
+                "calls": [],
+                "called_by": [],
+            }
+        if callee is not None and callee not in nodes_map:
+            nodes_map[callee] = {
+                "id": callee,
+                "name": callee,
+                "file": callee_file or "external",
+                "line": None,
+                "is_external": is_external,
+                "calls": [],
+                "called_by": [],
+            }
+        if caller is not None and callee is not None:
+            nodes_map[caller]["calls"].append(callee)
+            nodes_map[callee]["called_by"].append(caller)
+            add_edge(
+                {
+                    "from": caller,
+                    "to": callee,
+                    "file": caller_file,
+                    "line": line,
+                    "is_external": is_external,
+                }
+            )
+
+    if not nodes_map:
+        result = empty_call_graph(repository_id)
+    else:
+        nodes = list(nodes_map.values())
+        result = {
+            "repository_id": repository_id,
+            "total_functions": len(nodes),
+            "total_calls": len(edges),
+            "nodes": nodes,
+            "edges": edges,
+        }
+
+    if limit is not None:
+        # A short page is the last one
+        result["next_cursor"] = (
+            encode_cursor(*last) if last is not None and rows == limit else None
+        )
+    return result
@@ -3,8 +3,12 @@
 import re
 import uuid
 from dataclasses import dataclass
+from itertools import accumulate
 from typing import Any, Dict, List, Optional, TypedDict
 
+_SELF_REF_RE = re.compile(r"\bself\.|\bthis\.")
+_ATTR_REF_RE = re.compile(r"\b[a-zA-Z_]\w+\.\w+")
+
 
 @dataclass
 class SmellFinding:
@@ -194,14 +198,24 @@ class CodeSmellDetector:
         return findings
 
     def detect_feature_envy(
-        self, file_id: uuid.UUID, symbols: List[Dict], content: str
+        self,
+        file_id: uuid.UUID,
+        symbols: List[Dict],
+        content: str,
+        file_lines: Optional[List[str]] = None,
     ) -> List[SmellFinding]:
         """
         Detect Feature Envy: methods that use more data from other classes
         than from their own class.
+        `file_lines` is content.splitlines(keepends=True) when the caller
+        already has it.
         """
         findings = []
-        file_lines = content.splitlines()
+        if file_lines is None:
+            file_lines = content.splitlines(keepends=True)
+        # Offset of each line start; a method body is then a span of
+        # `content` searched in place instead of a re-joined copy
+        line_offsets = list(accumulate(map(len, file_lines), initial=0))
         
         for symbol in symbols:
             sym_type = symbol.get("type")
@@ -218,14 +232,19 @@ class CodeSmellDetector:
                 continue
                 
             # Adjust to 0-based index
-            lines = file_lines[max(0, start_line - 1) : end_line]
-            method_body = "\n".join(lines)
+            first, last, _ = slice(max(0, start_line - 1), end_line).indices(
+                len(file_lines)
+            )
+            body_start = line_offsets[first]
+            body_end = line_offsets[max(first, last)]
             
-            self_refs = len(re.findall(r"\bself\.|\bthis\.", method_body))
+            self_refs = len(_SELF_REF_RE.findall(content, body_start, body_end))
             
             # Simple heuristic for external access (Object.property)
             # Excluding self/this and common built-ins
-            external_refs = len(re.findall(r"\b[a-zA-Z_]\w+\.\w+", method_body)) - self_refs
+            external_refs = (
+                len(_ATTR_REF_RE.findall(content, body_start, body_end)) - self_refs
+            )
             
             if external_refs > 5 and external_refs > self_refs * 2:
                 findings.append(
@@ -250,7 +269,8 @@ class CodeSmellDetector:
     ) -> List[SmellFinding]:
         """Scan a single file for all code smells"""
         findings = []
-        file_lines = len(content.splitlines())
+        # Split once; god-class sizing and feature envy both use the lines
+        file_lines = content.splitlines(keepends=True)
         
         # Sprint 9: Missing Docstrings
         findings.extend(self.detect_missing_docstrings(file_id, symbols))
@@ -258,9 +278,11 @@ class CodeSmellDetector:
         # Existing smells
         findings.extend(self.detect_long_methods(file_id, symbols))
         findings.extend(
-            self.detect_god_classes(file_id, file_path, symbols, file_lines)
+            self.detect_god_classes(file_id, file_path, symbols, len(file_lines))
+        )
+        findings.extend(
+            self.detect_feature_envy(file_id, symbols, content, file_lines)
         )
-        findings.extend(self.detect_feature_envy(file_id, symbols, content))
 
         return findings
 
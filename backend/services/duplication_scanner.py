@@ -1,11 +1,94 @@
 """Code Duplication Detection using MinHash and Token-based Analysis"""
 
+import functools
 import hashlib
 import re
 import uuid
 from collections import defaultdict
-from dataclasses import dataclass
-from typing import Any, Dict, List, Set
+from dataclasses import dataclass, field, replace
+from itertools import combinations
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+
+_PY_COMMENT_RES = (
+    re.compile(r"#.*?$", re.MULTILINE),
+    re.compile(r'""".*?"""|\'\'\'.*?\'\'\'', re.DOTALL),
+)
+_C_COMMENT_RES = (
+    re.compile(r"//.*?$", re.MULTILINE),
+    re.compile(r"/\*.*?\*/", re.DOTALL),
+)
+_ASM_COMMENT_RES = (
+    re.compile(r";.*?$", re.MULTILINE),
+    re.compile(r"//.*?$", re.MULTILINE),
+    re.compile(r"#.*?$", re.MULTILINE),
+)
+_COBOL_COMMENT_RES = (
+    re.compile(r"^\s*\*.*?$", re.MULTILINE),
+    re.compile(r"\*>.*?$", re.MULTILINE),
+)
+# Comment patterns stripped before tokenizing, in order, per language
+_COMMENT_PATTERNS = {
+    "python": _PY_COMMENT_RES,
+    "c": _C_COMMENT_RES,
+    "cpp": _C_COMMENT_RES,
+    "c++": _C_COMMENT_RES,
+    "assembly": _ASM_COMMENT_RES,
+    "asm": _ASM_COMMENT_RES,
+    "x86": _ASM_COMMENT_RES,
+    "arm": _ASM_COMMENT_RES,
+    "cobol": _COBOL_COMMENT_RES,
+}
+
+_DEFAULT_TOKEN_RE = re.compile(
+    r"\b\w+\b|[+\-*/%=<>!&|^~]|[\[\]{}();,.]", re.MULTILINE
+)
+_C_TOKEN_RE = re.compile(
+    r"#\w+|"
+    r"\b\w+\b|"
+    r"[+\-*/%=<>!&|^~]|"
+    r"[\[\]{}();,.]|"
+    r"->|\.\.\.",
+    re.MULTILINE,
+)
+_ASM_TOKEN_RE = re.compile(
+    r"\b[a-zA-Z_]\w*\b|" r"0x[0-9a-fA-F]+|" r"\b\d+\b|" r"[\[\](),+\-*]",
+    re.MULTILINE,
+)
+_COBOL_TOKEN_RE = re.compile(
+    r"\b[A-Z0-9\-]+\b|" r"\d+|" r"[().,;]",
+    re.MULTILINE,
+)
+# Token pattern per language; anything else tokenizes like Python
+_TOKEN_PATTERNS = {
+    "python": _DEFAULT_TOKEN_RE,
+    "c": _C_TOKEN_RE,
+    "cpp": _C_TOKEN_RE,
+    "c++": _C_TOKEN_RE,
+    "assembly": _ASM_TOKEN_RE,
+    "asm": _ASM_TOKEN_RE,
+    "x86": _ASM_TOKEN_RE,
+    "arm": _ASM_TOKEN_RE,
+    "cobol": _COBOL_TOKEN_RE,
+}
+_COBOL_NOISE = frozenset(
+    {
+        "DIVISION",
+        "SECTION",
+        "PROCEDURE",
+        "DATA",
+        "WORKING-STORAGE",
+        "FILE",
+        "IDENTIFICATION",
+        "ENVIRONMENT",
+        "CONFIGURATION",
+    }
+)
+
+
+def _blake2b_hex(data: bytes) -> str:
+    """Default block fingerprint: 128-bit blake2b, same width as md5"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 
 @dataclass
@@ -20,6 +103,34 @@ class CodeBlock:
     tokens: List[str]
     hash_signature: str
     line_count: int
+    # MinHash of the token set, banded for LSH candidate lookup
+    signature: List[int] = field(default_factory=list)
+
+
+# Hash vectors of recently seen tokens, one cache per process shared by
+# every MinHashSignature. An entry holds num_hashes 128-bit ints (~6.5KB at
+# 128), so 2048 entries stay around 14MB; vocabularies are Zipfian, so the
+# frequent tokens still hit.
+_TOKEN_CACHE_SIZE = 2048
+
+
+@functools.lru_cache(maxsize=None)
+def _seed_prefixes(num_hashes: int) -> Tuple[bytes, ...]:
+    return tuple(str(i).encode() for i in range(num_hashes))
+
+
+@functools.lru_cache(maxsize=_TOKEN_CACHE_SIZE)
+def _token_hashes(token: str, num_hashes: int) -> Tuple[int, ...]:
+    """
+    All num_hashes hash values of one token: for seed i, the md5 of
+    f"{i}{token}" read as a 128-bit big-endian integer
+    """
+    data = token.encode()
+    md5 = hashlib.md5
+    return tuple(
+        int.from_bytes(md5(prefix + data).digest(), "big")
+        for prefix in _seed_prefixes(num_hashes)
+    )
 
 
 class MinHashSignature:
@@ -27,20 +138,17 @@ class MinHashSignature:
 
     def __init__(self, num_hashes: int = 128):
         self.num_hashes = num_hashes
-        self.hash_functions = [
-            lambda x, seed=i: int(hashlib.md5(f"{seed}{x}".encode()).hexdigest(), 16)
-            for i in range(num_hashes)
-        ]
 
     def compute_signature(self, tokens: Set[str]) -> List[int]:
         """Compute MinHash signature for a set of tokens"""
         if not tokens:
             return [0] * self.num_hashes
-        signature = []
-        for hash_func in self.hash_functions:
-            min_hash = min(hash_func(token) for token in tokens)
-            signature.append(min_hash)
-        return signature
+        # Overlapping blocks share most tokens, so each token is hashed once
+        # and the per-seed minimum is a C-level min over the columns
+        num_hashes = self.num_hashes
+        return list(
+            map(min, zip(*(_token_hashes(token, num_hashes) for token in tokens)))
+        )
 
     def similarity(self, sig1: List[int], sig2: List[int]) -> float:
         """Calculate Jaccard similarity between two signatures"""
@@ -58,80 +166,36 @@ class DuplicateScanner:
         min_block_size: int = 6,
         similarity_threshold: float = 0.8,
         min_tokens: int = 50,
+        hash_fn: Callable[[bytes], str] = _blake2b_hex,
     ):
         self.min_block_size = min_block_size
         self.similarity_threshold = similarity_threshold
         self.min_tokens = min_tokens
+        self.hash_fn = hash_fn
         self.minhash = MinHashSignature(num_hashes=128)
 
+    # LSH banding of the 128 MinHash values: 16 bands of 8 rows put the
+    # candidate cut-off near Jaccard 0.7, below similarity_threshold, so
+    # near duplicates still collide in at least one band
+    LSH_BANDS = 16
+
     def tokenize_code(self, code: str, language: str = "python") -> List[str]:
         """
         Tokenize code into meaningful tokens.
         Removes comments, whitespace, and normalizes identifiers.
         """
         language = language.lower()
-        if language == "python":
-            code = re.sub(r"#.*?$", "", code, flags=re.MULTILINE)
-            code = re.sub(r'""".*?"""|\'\'\'.*?\'\'\'', "", code, flags=re.DOTALL)
-        elif language in ["c", "cpp", "c++"]:
-            code = re.sub(r"//.*?$", "", code, flags=re.MULTILINE)
-            code = re.sub(r"/\*.*?\*/", "", code, flags=re.DOTALL)
-        elif language in ["assembly", "asm", "x86", "arm"]:
-            code = re.sub(r";.*?$", "", code, flags=re.MULTILINE)
-            code = re.sub(r"//.*?$", "", code, flags=re.MULTILINE)
-            code = re.sub(r"#.*?$", "", code, flags=re.MULTILINE)
-        elif language == "cobol":
-            code = re.sub(r"^\s*\*.*?$", "", code, flags=re.MULTILINE)
-            code = re.sub(r"\*>.*?$", "", code, flags=re.MULTILINE)
+        for pattern in _COMMENT_PATTERNS.get(language, ()):
+            code = pattern.sub("", code)
         tokens = self._extract_tokens(code, language)
         tokens = [t.lower() for t in tokens if len(t) > 1]
         return tokens
 
     def _extract_tokens(self, code: str, language: str) -> List[str]:
         """Extract tokens based on language syntax"""
-        if language == "python":
-            tokens = re.findall(
-                r"\b\w+\b|[+\-*/%=<>!&|^~]|[\[\]{}();,.]", code, re.MULTILINE
-            )
-        elif language in ["c", "cpp", "c++"]:
-            tokens = re.findall(
-                r"#\w+|"
-                r"\b\w+\b|"
-                r"[+\-*/%=<>!&|^~]|"
-                r"[\[\]{}();,.]|"
-                r"->|\.\.\.",
-                code,
-                re.MULTILINE,
-            )
-        elif language in ["assembly", "asm", "x86", "arm"]:
-            tokens = re.findall(
-                r"\b[a-zA-Z_]\w*\b|" r"0x[0-9a-fA-F]+|" r"\b\d+\b|" r"[\[\](),+\-*]",
-                code,
-                re.MULTILINE,
-            )
-        elif language == "cobol":
-            tokens = re.findall(
-                r"\b[A-Z0-9\-]+\b|" r"\d+|" r"[().,;]",
-                code,
-                re.MULTILINE,
-            )
-            cobol_noise = {
-                "DIVISION",
-                "SECTION",
-                "PROCEDURE",
-                "DATA",
-                "WORKING-STORAGE",
-                "FILE",
-                "IDENTIFICATION",
-                "ENVIRONMENT",
-                "CONFIGURATION",
-            }
-            tokens = [t for t in tokens if t.upper() not in cobol_noise]
-
-        else:
-            tokens = re.findall(
-                r"\b\w+\b|[+\-*/%=<>!&|^~]|[\[\]{}();,.]", code, re.MULTILINE
-            )
+        tokens = _TOKEN_PATTERNS.get(language, _DEFAULT_TOKEN_RE).findall(code)
+        if language == "cobol":
+            tokens = [t for t in tokens if t.upper() not in _COBOL_NOISE]
         return tokens
 
     def create_code_blocks(
@@ -156,7 +220,11 @@ class DuplicateScanner:
                 continue
             token_set = set(tokens)
             signature = self.minhash.compute_signature(token_set)
-            hash_sig = hashlib.md5(str(signature).encode()).hexdigest()
+            # MinHash values are 128-bit md5 ints: pack them as 16 bytes each
+            # rather than formatting 128 ~39-digit decimals per block
+            hash_sig = self.hash_fn(
+                b"".join(value.to_bytes(16, "big") for value in signature)
+            )
             block = CodeBlock(
                 file_id=file_id,
                 file_path=file_path,
@@ -166,6 +234,7 @@ class DuplicateScanner:
                 tokens=tokens,
                 hash_signature=hash_sig,
                 line_count=len(block_lines),
+                signature=signature,
             )
             blocks.append(block)
         return blocks
@@ -186,53 +255,41 @@ class DuplicateScanner:
         Returns list of duplication pairs with similarity scores.
         """
         duplicates = []
-        hash_buckets = defaultdict(list)
-        for block in all_blocks:
-            bucket_key = block.hash_signature[:8]
-            hash_buckets[bucket_key].append(block)
-        compared_pairs = set()
-        for block1 in all_blocks:
-            bucket_key = block1.hash_signature[:8]
-            candidates = hash_buckets.get(bucket_key, [])
-            for block2 in candidates:
-                if block1.file_id == block2.file_id:
-                    continue
-                pair_key = tuple(
-                    sorted(
-                        {
-                            (str(block1.file_id), block1.start_line),
-                            (str(block2.file_id), block2.start_line),
-                        }
-                    )
+        # Candidate pairs are blocks sharing any whole band; only those are
+        # compared, instead of every pair of blocks
+        rows = self.minhash.num_hashes // self.LSH_BANDS
+        candidates = set()
+        for band in range(0, rows * self.LSH_BANDS, rows):
+            buckets = defaultdict(list)
+            for index, block in enumerate(all_blocks):
+                buckets[tuple(block.signature[band : band + rows])].append(index)
+            for members in buckets.values():
+                if len(members) > 1:
+                    candidates.update(combinations(members, 2))
+        for i, j in sorted(candidates):
+            block1 = all_blocks[i]
+            block2 = all_blocks[j]
+            if block1.file_id == block2.file_id:
+                continue
+            similarity = self.minhash.similarity(block1.signature, block2.signature)
+            if similarity >= self.similarity_threshold:
+                duplicates.append(
+                    {
+                        "file1_id": block1.file_id,
+                        "file1_path": block1.file_path,
+                        "file1_start_line": block1.start_line,
+                        "file1_end_line": block1.end_line,
+                        "file2_id": block2.file_id,
+                        "file2_path": block2.file_path,
+                        "file2_start_line": block2.start_line,
+                        "file2_end_line": block2.end_line,
+                        "similarity_score": similarity,
+                        "duplicate_lines": min(block1.line_count, block2.line_count),
+                        "duplicate_tokens": min(len(block1.tokens), len(block2.tokens)),
+                        "code_snippet": block1.content[:500],
+                        "hash_signature": block1.hash_signature,
+                    }
                 )
-                if pair_key in compared_pairs:
-                    continue
-                compared_pairs.add(pair_key)
-                sig1 = self.minhash.compute_signature(set(block1.content))
-                sig2 = self.minhash.compute_signature(set(block2.content))
-                similarity = self.minhash.similarity(sig1, sig2)
-                if similarity >= self.similarity_threshold:
-                    duplicates.append(
-                        {
-                            "file1_id": block1.file_id,
-                            "file1_path": block1.file_path,
-                            "file1_start_line": block1.start_line,
-                            "file1_end_line": block1.end_line,
-                            "file2_id": block2.file_id,
-                            "file2_path": block2.file_path,
-                            "file2_start_line": block2.start_line,
-                            "file2_end_line": block2.end_line,
-                            "similarity_score": similarity,
-                            "duplicate_lines": min(
-                                block1.line_count, block2.line_count
-                            ),
-                            "duplicate_tokens": min(
-                                len(block1.tokens), len(block2.tokens)
-                            ),
-                            "code_snippet": block1.content[:500],
-                            "hash_signature": block1.hash_signature,
-                        }
-                    )
         duplicates.sort(key=lambda x: x["similarity_score"], reverse=True)
         return duplicates
 
@@ -244,20 +301,41 @@ class DuplicateScanner:
         Returns:
             List of duplication findings
         """
+        return self.find_duplicate(self.create_repository_blocks(files))
+
+    def create_repository_blocks(self, files: List[Dict[str, Any]]) -> List[CodeBlock]:
+        """
+        Code blocks of every file, in file order. Per-file and independent,
+        so callers may split `files` across workers and concatenate.
+        """
         all_blocks = []
+        # Copied/vendored files are common; blocks of a body already seen
+        # are re-labelled instead of re-tokenized and re-hashed
+        blocks_by_fingerprint: Dict[bytes, List[CodeBlock]] = {}
         for file in files:
             if not file.get("content"):
                 continue
             language = file.get("language") or self._detect_language(file["path"])
-            blocks = self.create_code_blocks(
-                file_id=file["id"],
-                file_path=file["path"],
-                content=file["content"],
-                language=language,
-            )
+            fingerprint = hashlib.blake2b(
+                f"{language}\0{file['content']}".encode(errors="ignore"),
+                digest_size=16,
+            ).digest()
+            seen = blocks_by_fingerprint.get(fingerprint)
+            if seen is not None:
+                blocks = [
+                    replace(block, file_id=file["id"], file_path=file["path"])
+                    for block in seen
+                ]
+            else:
+                blocks = self.create_code_blocks(
+                    file_id=file["id"],
+                    file_path=file["path"],
+                    content=file["content"],
+                    language=language,
+                )
+                blocks_by_fingerprint[fingerprint] = blocks
             all_blocks.extend(blocks)
-        duplicates = self.find_duplicate(all_blocks)
-        return duplicates
+        return all_blocks
 
     def _detect_language(self, file_path: str) -> str:
         """Detect language from file extension"""
@@ -1,3 +1,8 @@
+from .analysis_scans import (
+    full_analysis_job,
+    scan_code_smells_job,
+    scan_duplications_job,
+)
 from .extract_call_graph import extract_call_graph_task
 from .generate_embeddings import generate_embeddings_for_repository
 from .import_github import import_github_repository
@@ -8,4 +13,7 @@ __all__ = [
     "generate_embeddings_for_repository",
     "import_github_repository",
     "extract_call_graph_task",
+    "scan_duplications_job",
+    "scan_code_smells_job",
+    "full_analysis_job",
 ]
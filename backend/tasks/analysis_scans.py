@@ -0,0 +1,45 @@
+"""
+Celery tasks for the analysis scans.
+
+Duplication and code smell scans are CPU heavy and can run for minutes, so
+they run on a worker rather than in the API process. They have their own
+"analysis" queue, consumed by a solo-pool worker whose main process is not
+daemonic and so may start the scans' process pool (see
+routers.analysis._scan_executor). The scan pipelines themselves stay in
+routers.analysis next to the endpoints that read their results; each task
+just drives one of them to completion. A pipeline that fails rolls back and
+re-raises, so the job ends in FAILURE rather than reporting success.
+"""
+
+import asyncio
+from uuid import UUID
+
+from celery_app import celery_app
+
+
+@celery_app.task(bind=True, name="tasks.analysis_scans.scan_duplications_job")
+def scan_duplications_job(self, repository_id: str):
+    """Scan a repository for code duplications"""
+    # Imported here: routers.analysis imports this module to enqueue jobs
+    from routers.analysis import scan_duplications_task
+
+    asyncio.run(scan_duplications_task(UUID(repository_id)))
+    return {"repository_id": repository_id, "scan": "duplications"}
+
+
+@celery_app.task(bind=True, name="tasks.analysis_scans.scan_code_smells_job")
+def scan_code_smells_job(self, repository_id: str):
+    """Scan a repository's changed files for code smells"""
+    from routers.analysis import scan_code_smells_task
+
+    asyncio.run(scan_code_smells_task(UUID(repository_id)))
+    return {"repository_id": repository_id, "scan": "code_smells"}
+
+
+@celery_app.task(bind=True, name="tasks.analysis_scans.full_analysis_job")
+def full_analysis_job(self, repository_id: str):
+    """Both scans over one pass of the files, then a metrics snapshot"""
+    from routers.analysis import full_analysis_task
+
+    asyncio.run(full_analysis_task(UUID(repository_id)))
+    return {"repository_id": repository_id, "scan": "full_analysis"}
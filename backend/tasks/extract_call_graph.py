@@ -4,15 +4,19 @@ Runs after repository parsing is complete.
 """
 
 import os
+from collections import defaultdict
 from typing import Dict, List
 from uuid import UUID
 
+from sqlalchemy import select
+
 from celery_app import celery_app
 from database import SessionLocal
 from models import File, Repository, Symbol
 from models.call_relationship import CallRelationship
 from models.repository import RepoStatus
 from analyzers.call_graph import CallGraphAnalyzer
+from services.call_graph_payload import call_graph_version, store_call_graph_payload
 
 
 @celery_app.task(bind=True, name="tasks.extract_call_graph.extract_call_graph_task")
@@ -53,6 +57,34 @@ def extract_call_graph_task(self, repository_id: str):
                 "status": "no_files"
             }
         
+        # All symbols of the repository in one query: grouped per file for
+        # the analyzer, and keyed by (file path, name) for the caller/callee
+        # lookups when saving, instead of a query per file and per call
+        path_by_file_id = {file.id: file.file_path for file in files}
+        symbols_by_file: Dict[UUID, List[dict]] = defaultdict(list)
+        symbol_id_by_key: Dict[tuple, UUID] = {}
+        symbol_rows = db.execute(
+            select(
+                Symbol.id,
+                Symbol.file_id,
+                Symbol.name,
+                Symbol.type,
+                Symbol.line_start,
+                Symbol.line_end,
+            ).where(Symbol.file_id.in_(list(path_by_file_id)))
+        )
+        for sym_id, file_id, name, sym_type, line_start, line_end in symbol_rows:
+            symbols_by_file[file_id].append(
+                {
+                    "id": str(sym_id),
+                    "name": name,
+                    "type": sym_type.value,
+                    "line_start": line_start,
+                    "line_end": line_end,
+                }
+            )
+            symbol_id_by_key.setdefault((path_by_file_id[file_id], name), sym_id)
+
         # Build files_data structure for analyzer
         files_data = []
         
@@ -62,26 +94,11 @@ def extract_call_graph_task(self, repository_id: str):
                 print(f"  ⚠️  No source code for: {file.file_path}")
                 continue
             
-            # Get symbols for this file
-            symbols = db.query(Symbol).filter(Symbol.file_id == file.id).all()
-            
-            # Convert symbols to dict format
-            symbols_data = [
-                {
-                    "id": str(sym.id),
-                    "name": sym.name,
-                    "type": sym.type.value,
-                    "line_start": sym.line_start,
-                    "line_end": sym.line_end,
-                }
-                for sym in symbols
-            ]
-            
             files_data.append({
                 "file_path": file.file_path,
                 "language": file.language,
                 "source_code": file.source,  # Read from database instead of disk
-                "symbols": symbols_data,
+                "symbols": symbols_by_file.get(file.id, []),
             })
         
         if not files_data:
@@ -145,16 +162,8 @@ def extract_call_graph_task(self, repository_id: str):
                     caller_file = call.get("caller_file")
                     
                     if caller_name and caller_file:
-                        # Query for the caller symbol
-                        caller_symbol = db.query(Symbol).join(File).filter(
-                            File.repository_id == repository_id,
-                            File.file_path == caller_file,
-                            Symbol.name == caller_name
-                        ).first()
-                        
-                        if caller_symbol:
-                            caller_symbol_id = caller_symbol.id
-                        else:
+                        caller_symbol_id = symbol_id_by_key.get((caller_file, caller_name))
+                        if not caller_symbol_id:
                             print(f"  ⚠️  Caller symbol not found: {caller_name} in {caller_file}")
                             skipped_count += 1
                             continue
@@ -172,14 +181,7 @@ def extract_call_graph_task(self, repository_id: str):
                     callee_file = call.get("callee_file")
                     
                     if callee_name and callee_file:
-                        callee_symbol = db.query(Symbol).join(File).filter(
-                            File.repository_id == repository_id,
-                            File.file_path == callee_file,
-                            Symbol.name == callee_name
-                        ).first()
-                        
-                        if callee_symbol:
-                            callee_symbol_id = callee_symbol.id
+                        callee_symbol_id = symbol_id_by_key.get((callee_file, callee_name))
                 
                 # Create call relationship record
                 call_record = CallRelationship(
@@ -202,6 +204,15 @@ def extract_call_graph_task(self, repository_id: str):
                 continue
         
         db.commit()
+
+        # Materialize the full graph now so the endpoint serves it as stored
+        try:
+            version = call_graph_version(db, repository_id)
+            if version is not None:
+                store_call_graph_payload(db, repository_id, version)
+        except Exception as e:
+            db.rollback()
+            print(f"  ⚠️  Call graph payload not stored: {e}")
         
         print(f"✅ Call graph extraction complete for {repository_id}")
         print(f"   Files analyzed: {len(files_data)}")
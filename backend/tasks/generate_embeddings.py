@@ -62,14 +62,18 @@ def generate_embeddings_for_repository(self, repository_id: str):
         print(f"  🔄 Calling OpenAI API...")
         embeddings = generate_embeddings_batch(texts)
         print(f"  💾 Saving embeddings to database...")
-        for symbol, embedding in zip(symbols, embeddings):
-            embedding_records = Embedding(
-                symbol_id=symbol.id,
-                embedding=embedding,
-                model=settings.openai_model,
-                dimensions=settings.embedding_dimensions,
-            )
-            db.add(embedding_records)
+        Embedding.bulk_insert(
+            db,
+            [
+                {
+                    "symbol_id": symbol.id,
+                    "embedding": embedding,
+                    "model": settings.openai_model,
+                    "dimensions": settings.embedding_dimensions,
+                }
+                for symbol, embedding in zip(symbols, embeddings)
+            ],
+        )
         db.commit()
         print(f"  ✅ Generated {len(embeddings)} embeddings")
         return {
@@ -4,12 +4,14 @@ Used as a complement to parse_repository.py for 100k+ line files.
 """
 
 import asyncio
+from functools import lru_cache
 from typing import Dict, List
 
 from celery_app import celery_app
 from database import SessionLocal
 from models.symbol import Symbol, SymbolType
 from parsers.streaming_parsers import StreamingParser
+from parsers.symbol_batch import SymbolBatch
 
 streaming_parsers = StreamingParser()
 
@@ -20,14 +22,18 @@ def parse_file_task(self, file_id: int, file_path: str, repository_id: str):
     Parse a single file with batched DB inserts.
     Used for large files (100k+ lines) identified during repository parsing.
     """
-    stats = streaming_parsers.get_file_stats(file_path)
+    # One read serves both the stats and the parse; an unreadable file
+    # gives empty stats and no source, and parse_in_batches reports it
+    stats, source = streaming_parsers.open_and_classify(file_path)
     print(
         f"📄 Parsing file: {file_path} "
         f"({stats.get('line_count', '?')} lines, "
         f"{stats.get('size_bytes', 0) // 1024} KB)"
     )
     total_symbols = 0
-    for batch in streaming_parsers.parse_in_batches(file_path, repository_id):
+    for batch in streaming_parsers.parse_in_batches(
+        file_path, repository_id, source=source
+    ):
         _batch_insert_symbols(file_id, batch)
         total_symbols += len(batch)
         print(f"  ✓ Inserted batch of {len(batch)} symbols (total: {total_symbols})")
@@ -40,25 +46,37 @@ def parse_file_task(self, file_id: int, file_path: str, repository_id: str):
     }
 
 
+@lru_cache(maxsize=None)
+def _symbol_type(raw_type: str) -> SymbolType:
+    """Map a parser's type string to SymbolType (memoized per distinct value)."""
+    if raw_type == "class":
+        raw_type = "class_"
+    if raw_type not in SymbolType.__members__:
+        raw_type = "function"
+    return SymbolType[raw_type]
+
+
 def _batch_insert_symbols(file_id: int, symbols: List[Dict]):
     """Insert a batch of symbols into the database efficiently."""
+    # Columnize once, then map the type column; no per-row ORM objects
+    batch = SymbolBatch.from_records(symbols)
+    types = [_symbol_type(raw_type) for raw_type in batch.types]
+    rows = [
+        {
+            "file_id": file_id,
+            "name": name,
+            "type": symbol_type,
+            "line_start": line_start,
+            "line_end": line_end,
+            "signature": signature,
+        }
+        for name, symbol_type, signature, line_start, line_end in zip(
+            batch.names, types, batch.signatures, batch.line_starts, batch.line_ends
+        )
+    ]
     db = SessionLocal()
     try:
-        for sym in symbols:
-            raw_type = (sym.get("type") or "").strip()
-            if raw_type == "class":
-                raw_type = "class_"
-            if raw_type not in SymbolType.__members__:
-                raw_type = "function"
-            symbol_record = Symbol(
-                file_id=file_id,
-                name=sym.get("name", "unknown"),
-                type=SymbolType[raw_type],
-                line_start=sym.get("line_start", 1),
-                line_end=sym.get("line_end"),
-                signature=sym.get("signature"),
-            )
-            db.add(symbol_record)
+        Symbol.bulk_insert(db, rows)
         db.commit()
     except Exception as e:
         db.rollback()
@@ -95,6 +95,28 @@ def cache(expire: int = 300, prefix: str = "api"):
     return decorator
 
 
+def get_cached(key: str) -> Optional[str]:
+    """Raw cached value for an explicit key, or None (miss / Redis down)"""
+    if not REDIS_AVAILABLE or redis_client is None:
+        return None
+    try:
+        cached = redis_client.get(key)
+    except Exception as e:
+        print(f"⚠️  Cache read failed: {e}")
+        return None
+    return cached if isinstance(cached, str) else None
+
+
+def set_cached(key: str, value: str, expire: int = 300):
+    """Store a pre-serialized value under an explicit key"""
+    if not REDIS_AVAILABLE or redis_client is None:
+        return
+    try:
+        redis_client.setex(key, expire, value)
+    except Exception as e:
+        print(f"⚠️  Cache write failed: {e}")
+
+
 def invalidate_cache(pattern: str):
     """Invalidate all cache keys matching a pattern (e.g. 'call_graph:*')"""
     if not REDIS_AVAILABLE or redis_client is None:
@@ -31,7 +31,7 @@ export const SearchResults: React.FC<SearchResultsProps> = ({
   const getTypeIcon = (type: string) => {
     const icons: Record<string, string> = {
       function: "🔵",
-      class_: "🟣",
+      class: "🟣",
       method: "🟢",
       variable: "🟡",
     };
@@ -42,7 +42,7 @@ export const SearchResults: React.FC<SearchResultsProps> = ({
     const colors: Record<string, string> = {
       function:
         "bg-blue-100 dark:bg-blue-900/30 text-blue-700 dark:text-blue-300 border-blue-200 dark:border-blue-800",
-      class_:
+      class:
         "bg-purple-100 dark:bg-purple-900/30 text-purple-700 dark:text-purple-300 border-purple-200 dark:border-purple-800",
       method:
         "bg-green-100 dark:bg-green-900/30 text-green-700 dark:text-green-300 border-green-200 dark:border-green-800",